@@ -72,7 +72,14 @@ class SimpleVoiceRecorder:
         try:
             logger.info("🤖 Cargando modelo Whisper 'turbo'...")
             # Cargar modelo con configuración optimizada
-            self.whisper_model = whisper.load_model("turbo", device="cpu")
+            # Usar el registro de modelos de la app si está disponible (mismo directorio y
+            # archivo mapeado en memoria que la GUI, SIMPLEVOICE_FAST_LOAD=1)
+            try:
+                sys.path.insert(0, str(Path(__file__).parent / "src"))
+                from model_registry import load_checkpoint
+                self.whisper_model = load_checkpoint("turbo")
+            except ImportError:
+                self.whisper_model = whisper.load_model("turbo", device="cpu")
             logger.info("✅ Modelo Whisper cargado exitosamente")
         except Exception as e:
             logger.error(f"❌ Error cargando modelo Whisper: {e}")
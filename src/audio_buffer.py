@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Audio Buffer Module
+Growable int16 capture buffer written in place by the recording thread
+"""
+
+import os
+import time
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+
+def pcm16_to_float32(samples: np.ndarray, channels: int = 1) -> np.ndarray:
+    """
+    Convert int16 PCM into the normalized float32 mono array Whisper expects
+
+    Args:
+        samples: Interleaved int16 samples
+        channels: Number of interleaved channels
+    """
+    audio = samples.astype(np.float32)
+    audio *= 1.0 / 32768.0
+
+    # Whisper works on mono audio: downmix interleaved channels if needed
+    if channels > 1:
+        audio = audio[:len(audio) - len(audio) % channels]
+        audio = audio.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+
+    return audio
+
+
+class AudioBuffer:
+    """
+    Preallocated int16 sample buffer with amortized growth.
+
+    The capture thread appends chunks in place (no per-chunk Python objects) and
+    transcription reads a zero-copy view of the samples recorded so far.
+    """
+
+    def __init__(self, initial_seconds: float = 30.0, sample_rate: int = 16000, channels: int = 1):
+        """
+        Initialize the buffer
+
+        Args:
+            initial_seconds: Capacity reserved up front, in seconds of audio
+            sample_rate: Sample rate of the captured audio
+            channels: Number of interleaved channels
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._initial_capacity = max(1, int(initial_seconds * sample_rate * channels))
+        self._data = np.empty(self._initial_capacity, dtype=np.int16)
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        """Number of samples that fit before the next reallocation"""
+        return len(self._data)
+
+    @property
+    def duration(self) -> float:
+        """Recorded duration in seconds"""
+        return self._length / float(self.sample_rate * self.channels)
+
+    @property
+    def spilled(self) -> bool:
+        """True if the samples live in a journal file instead of RAM"""
+        return False
+
+    def append(self, chunk: Union[bytes, np.ndarray]):
+        """
+        Copy a chunk of paInt16 audio at the end of the buffer
+
+        Args:
+            chunk: Raw bytes from PyAudio or an int16 array
+        """
+        samples = np.frombuffer(chunk, dtype=np.int16) if isinstance(chunk, (bytes, bytearray, memoryview)) else chunk
+        count = len(samples)
+        if count == 0:
+            return
+
+        with self._lock:
+            end = self._length + count
+            if end > len(self._data):
+                self._grow(end)
+            self._data[self._length:end] = samples
+            self._set_length(end)
+
+    def _set_length(self, length: int):
+        """Record the number of valid samples (called with the lock held)"""
+        self._length = length
+
+    def _grow(self, required: int):
+        """Double the capacity (at least up to `required`) keeping the recorded samples"""
+        capacity = max(required, 2 * len(self._data))
+        data = np.empty(capacity, dtype=np.int16)
+        data[:self._length] = self._data[:self._length]
+        self._data = data
+
+    def view(self) -> np.ndarray:
+        """Zero-copy view of the samples recorded so far (valid until the next growth or clear)"""
+        with self._lock:
+            return self._data[:self._length]
+
+    def to_float32(self) -> np.ndarray:
+        """Normalized float32 mono copy of the recording, as Whisper expects"""
+        return pcm16_to_float32(self.view(), self.channels)
+
+    def discard(self, count: int):
+        """
+        Drop the oldest samples, keeping the rest at the start of the buffer
+
+        Args:
+            count: Number of samples to drop
+        """
+        with self._lock:
+            count = min(count, self._length)
+            if count <= 0:
+                return
+            remaining = self._length - count
+            self._data[:remaining] = self._data[count:self._length]
+            self._set_length(remaining)
+
+    def clear(self, release: bool = False):
+        """
+        Forget the recorded samples
+
+        Args:
+            release: Also shrink the storage back to the initial capacity
+        """
+        with self._lock:
+            self._length = 0
+            if release and len(self._data) > self._initial_capacity:
+                self._data = np.empty(self._initial_capacity, dtype=np.int16)
+
+
+# Journal file layout: 64-byte header followed by raw int16 samples
+JOURNAL_MAGIC = b"SVJ1"
+JOURNAL_HEADER_BYTES = 64
+JOURNAL_SUFFIX = ".svj"
+
+
+class JournalBuffer(AudioBuffer):
+    """
+    AudioBuffer that spills to a memory-mapped journal file past a RAM threshold.
+
+    Once spilled, samples are appended to the mapped file and `view()` returns a
+    memmap slice, so long recordings never need to fit in memory. The header
+    stores the number of valid samples after every append: if the app dies,
+    the journal can be reopened with `open_journal` and transcribed again.
+    """
+
+    def __init__(self, journal_dir: str, spill_threshold_mb: float = 64.0, **kwargs):
+        """
+        Initialize the buffer
+
+        Args:
+            journal_dir: Directory for the journal files
+            spill_threshold_mb: RAM used before the recording moves to disk
+            **kwargs: Arguments for AudioBuffer
+        """
+        super().__init__(**kwargs)
+        self.journal_dir = Path(journal_dir)
+        self.spill_threshold = int(spill_threshold_mb * 1024 * 1024 / 2)  # in int16 samples
+        self.path: Optional[Path] = None
+        self._header_length = None
+
+    @property
+    def spilled(self) -> bool:
+        """True once the recording lives in the journal file"""
+        return self.path is not None
+
+    def _grow(self, required: int):
+        capacity = max(required, 2 * len(self._data))
+        if self.path is not None:
+            self._map(capacity)
+        elif required > self.spill_threshold:
+            self._spill(capacity)
+        else:
+            super()._grow(required)
+
+    def _spill(self, capacity: int):
+        """Move the samples recorded so far into a new journal file"""
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.journal_dir / f"journal-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{JOURNAL_SUFFIX}"
+
+        header = bytearray(JOURNAL_HEADER_BYTES)
+        header[0:4] = JOURNAL_MAGIC
+        header[4:8] = int(self.sample_rate).to_bytes(4, "little")
+        header[8:10] = int(self.channels).to_bytes(2, "little")
+        with open(self.path, "wb") as journal:
+            journal.write(header)
+
+        recorded = self._data[:self._length]
+        self._map(capacity)
+        self._data[:len(recorded)] = recorded
+        self._set_length(self._length)
+
+    def _map(self, capacity: int):
+        """(Re)map the journal file with room for `capacity` samples"""
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
+        with open(self.path, "r+b") as journal:
+            journal.truncate(JOURNAL_HEADER_BYTES + capacity * 2)
+        self._data = np.memmap(self.path, dtype=np.int16, mode="r+", offset=JOURNAL_HEADER_BYTES, shape=(capacity,))
+        self._header_length = np.memmap(self.path, dtype=np.uint64, mode="r+", offset=16, shape=(1,))
+
+    def _set_length(self, length: int):
+        self._length = length
+        if self._header_length is not None:
+            self._header_length[0] = length
+
+    def clear(self, release: bool = False):
+        """Start a new recording; a previous journal file is kept until `remove_journal`"""
+        with self._lock:
+            if self.path is not None:
+                self._data.flush()
+                self._data = np.empty(self._initial_capacity, dtype=np.int16)
+                self._header_length = None
+                self.path = None
+        super().clear(release)
+
+    def remove_journal(self, path: Optional[Path] = None):
+        """
+        Delete a journal once its recording has been transcribed
+
+        Args:
+            path: Journal to delete (default: the current one)
+        """
+        path = path or self.path
+        if path is None:
+            return
+        if path == self.path:
+            self.clear(release=True)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def list_journals(journal_dir: str) -> List[Path]:
+    """Journal files left in a directory, oldest first"""
+    directory = Path(journal_dir)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"*{JOURNAL_SUFFIX}"), key=lambda p: p.stat().st_mtime)
+
+
+def open_journal(path: str) -> Tuple[np.ndarray, int, int]:
+    """
+    Map a journal file read-only
+
+    Returns:
+        (int16 samples as a memmap, sample rate, channels)
+    """
+    with open(path, "rb") as journal:
+        header = journal.read(JOURNAL_HEADER_BYTES)
+    if len(header) < JOURNAL_HEADER_BYTES or header[0:4] != JOURNAL_MAGIC:
+        raise ValueError(f"Not a SimpleVoice journal: {path}")
+
+    sample_rate = int.from_bytes(header[4:8], "little")
+    channels = int.from_bytes(header[8:10], "little")
+    length = int.from_bytes(header[16:24], "little")
+
+    # Never trust the header beyond the real file size (the app may have died mid-write)
+    available = (os.path.getsize(path) - JOURNAL_HEADER_BYTES) // 2
+    length = min(length, available)
+    if length == 0:
+        return np.empty(0, dtype=np.int16), sample_rate, channels
+    samples = np.memmap(path, dtype=np.int16, mode="r", offset=JOURNAL_HEADER_BYTES, shape=(length,))
+    return samples, sample_rate, channels
+
+
+class RingBuffer:
+    """
+    Fixed-size int16 ring that keeps only the most recent samples.
+
+    Used as pre-roll while a warm input stream is idle, so the audio captured
+    just before the hotkey press can be prepended to the recording.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the ring
+
+        Args:
+            capacity: Number of samples to keep
+        """
+        self._data = np.zeros(max(0, capacity), dtype=np.int16)
+        self._pos = 0
+        self._filled = 0
+
+    def __len__(self) -> int:
+        return self._filled
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of samples kept"""
+        return len(self._data)
+
+    def write(self, chunk: Union[bytes, np.ndarray]):
+        """Write a chunk, overwriting the oldest samples once the ring is full"""
+        capacity = len(self._data)
+        if capacity == 0:
+            return
+
+        samples = np.frombuffer(chunk, dtype=np.int16) if isinstance(chunk, (bytes, bytearray, memoryview)) else chunk
+        count = len(samples)
+        if count >= capacity:
+            self._data[:] = samples[-capacity:]
+            self._pos = 0
+            self._filled = capacity
+            return
+
+        end = self._pos + count
+        if end <= capacity:
+            self._data[self._pos:end] = samples
+        else:
+            first = capacity - self._pos
+            self._data[self._pos:] = samples[:first]
+            self._data[:count - first] = samples[first:]
+        self._pos = end % capacity
+        self._filled = min(capacity, self._filled + count)
+
+    def read(self) -> np.ndarray:
+        """Copy of the stored samples in chronological order"""
+        if self._filled < len(self._data):
+            return self._data[:self._filled].copy()
+        return np.concatenate((self._data[self._pos:], self._data[:self._pos]))
+
+    def clear(self):
+        """Forget the stored samples"""
+        self._pos = 0
+        self._filled = 0
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Model Benchmark
+Compare load time, memory and transcription speed of model variants on this CPU
+
+    python src/benchmark.py --models turbo turbo-int8 --audio sample.wav
+    python src/benchmark.py --models turbo large --draft base --audio sample.wav
+"""
+
+import os
+import sys
+import time
+import wave
+import queue
+import argparse
+import statistics
+import multiprocessing
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_RATE = 16000
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident memory in MB (peak on systems without /proc)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def load_audio(path: Optional[str], seconds: float) -> np.ndarray:
+    """
+    Benchmark audio: a 16 kHz mono WAV file, any file ffmpeg can read, or a synthetic signal
+
+    The synthetic signal only measures throughput; use a real recording to compare output quality.
+    """
+    if path is None:
+        t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+        return (0.1 * np.sin(2 * np.pi * (150 + 100 * np.sin(2 * np.pi * 0.5 * t)) * t)).astype(np.float32)
+
+    try:
+        with wave.open(path, "rb") as wav:
+            if wav.getframerate() == SAMPLE_RATE and wav.getsampwidth() == 2:
+                from audio_buffer import pcm16_to_float32
+                samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+                return pcm16_to_float32(samples, wav.getnchannels())
+    except wave.Error:
+        pass
+
+    import whisper
+    return whisper.load_audio(path)
+
+
+def run_variant(model_name: str, audio: np.ndarray, runs: int, language: Optional[str], results,
+                draft_name: Optional[str] = None):
+    """
+    Measure one model variant (runs in its own process so memory figures do not mix)
+
+    With `draft_name`, the same clip is also transcribed with speculative decoding
+    (Whisper engine only) and compared with the plain transcript.
+    """
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    from model_manager import estimate_model_bytes
+    from engines import WhisperEngine, create_engine
+
+    baseline = rss_mb()
+    started = time.perf_counter()
+    model = create_engine(model_name)
+    load_s = time.perf_counter() - started
+    loaded = rss_mb()
+
+    options = dict(language=language, fp16=False, temperature=0.0, beam_size=1, best_of=1,
+                   condition_on_previous_text=False, verbose=None)
+    model.transcribe(audio[:SAMPLE_RATE], **options)  # warm-up
+
+    timings = []
+    text = ""
+    for _ in range(runs):
+        started = time.perf_counter()
+        text = model.transcribe(audio, **options)["text"].strip()
+        timings.append(time.perf_counter() - started)
+
+    row = {
+        "model": model_name,
+        "load_s": load_s,
+        "weights_mb": estimate_model_bytes(model) / 1024 / 1024,
+        "rss_mb": (loaded - baseline) if loaded is not None and baseline is not None else None,
+        "transcribe_s": statistics.median(timings),
+        "text": text,
+    }
+
+    if draft_name:
+        draft = create_engine(draft_name)
+        if isinstance(model, WhisperEngine) and isinstance(draft, WhisperEngine):
+            from speculative import incompatibility
+            row["speculation_error"] = incompatibility(model.model, draft.model)
+        else:
+            row["speculation_error"] = "needs the whisper engine for both models"
+        if row["speculation_error"] is None:
+            model.transcribe(audio[:SAMPLE_RATE], draft=draft, **options)  # warm-up
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                result = model.transcribe(audio, draft=draft, **options)
+                timings.append(time.perf_counter() - started)
+            row["speculative_s"] = statistics.median(timings)
+            row["speculation"] = result["speculation"]
+            row["identical"] = result["text"].strip() == text
+    results.put(row)
+
+
+def receive(results, process, poll_s: float = 1.0) -> Optional[dict]:
+    """Result of a variant process, or None if it exits without one (no time limit while it runs)"""
+    while True:
+        try:
+            return results.get(timeout=poll_s)
+        except queue.Empty:
+            if not process.is_alive():
+                break
+    try:
+        return results.get(timeout=5)  # sent just before exiting
+    except queue.Empty:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SimpleVoice model variants on this machine")
+    parser.add_argument("--models", nargs="+", default=["turbo", "turbo-int8"],
+                        help="Model names, e.g. turbo turbo-int8 turbo-bf16 faster-whisper:turbo-int8 whisper.cpp:turbo")
+    parser.add_argument("--audio", help="Audio file (default: 30 s synthetic signal)")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Length of the synthetic signal")
+    parser.add_argument("--runs", type=int, default=3, help="Timed transcriptions per model (median is reported)")
+    parser.add_argument("--language", default=None, help="Language code (default: auto-detect)")
+    parser.add_argument("--draft", default=None,
+                        help="Also time speculative decoding with this draft model (e.g. base) and check the transcript")
+    args = parser.parse_args()
+
+    audio = load_audio(args.audio, args.seconds)
+    duration = len(audio) / SAMPLE_RATE
+    print(f"🎧 Audio: {duration:.1f}s | CPU threads: {os.cpu_count()}")
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for model_name in args.models:
+        print(f"⏱️ {model_name}...", flush=True)
+        results = context.Queue()
+        process = context.Process(target=run_variant,
+                                  args=(model_name, audio, args.runs, args.language, results, args.draft))
+        process.start()
+        # Read before joining: a child still flushing its result to the queue never exits
+        row = receive(results, process)
+        process.join()
+        if row is None:
+            print(f"❌ {model_name} failed (exit code {process.exitcode})")
+        else:
+            rows.append(row)
+
+    if not rows:
+        return 1
+
+    print()
+    print(f"{'model':<28}{'load s':>8}{'weights MB':>12}{'RSS MB':>9}{'transcribe s':>14}{'x realtime':>12}")
+    for row in rows:
+        rss = f"{row['rss_mb']:.0f}" if row["rss_mb"] is not None else "n/a"
+        print(f"{row['model']:<28}{row['load_s']:>8.1f}{row['weights_mb']:>12.0f}{rss:>9}"
+              f"{row['transcribe_s']:>14.2f}{duration / row['transcribe_s']:>12.1f}")
+
+    if args.draft:
+        print()
+        print(f"{'model':<28}{'draft':>8}{'speculative s':>15}{'speedup':>9}{'accepted':>10}{'tokens/pass':>13}"
+              f"{'same text':>11}")
+        for row in rows:
+            if row.get("speculation_error"):
+                print(f"{row['model']:<28}{args.draft:>8}   n/a: {row['speculation_error']}")
+                continue
+            stats = row["speculation"]
+            print(f"{row['model']:<28}{args.draft:>8}{row['speculative_s']:>15.2f}"
+                  f"{row['transcribe_s'] / row['speculative_s']:>8.2f}x{stats['acceptance']:>10.0%}"
+                  f"{stats['tokens_per_pass']:>13.1f}{'yes' if row['identical'] else 'NO':>11}")
+
+    print()
+    for row in rows:
+        print(f"📝 {row['model']}: {row['text'][:120]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
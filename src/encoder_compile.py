@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Encoder Compile Module
+TorchScript-traced Whisper encoder, cached on disk per model and per machine
+"""
+
+import os
+import time
+import hashlib
+import platform
+import warnings
+from pathlib import Path
+from typing import Callable, Optional
+
+from quantization import split_model_name
+
+# Whisper always encodes 30 s windows: 3000 mel frames
+N_FRAMES = 3000
+
+
+def cache_dir() -> Path:
+    """Directory of the traced encoders (SIMPLEVOICE_CACHE_DIR or ~/.cache/simplevoice)"""
+    root = os.environ.get("SIMPLEVOICE_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "simplevoice")
+    return Path(root) / "compiled"
+
+
+def machine_key() -> str:
+    """Identify what a traced graph depends on: OS, CPU architecture and vector ISA, torch version"""
+    import torch
+
+    try:
+        capability = torch.backends.cpu.get_cpu_capability()
+    except AttributeError:
+        capability = "unknown"
+    version = torch.__version__.split("+")[0]
+    return f"{platform.system()}-{platform.machine()}-{capability}-torch{version}".lower()
+
+
+def model_fingerprint(model) -> str:
+    """Short hash of the dimensions and first convolution, so a changed checkpoint never reuses old weights"""
+    weight = model.encoder.conv1.weight.detach().float().contiguous()
+    digest = hashlib.sha1(repr(model.dims).encode())
+    digest.update(weight.numpy().tobytes())
+    return digest.hexdigest()[:12]
+
+
+def artifact_path(model_name: str, model) -> Path:
+    return cache_dir() / f"{model_name}-{model_fingerprint(model)}-{machine_key()}.pt"
+
+
+def _encoder_wrapper(encoder):
+    """Module that runs the encoder's own forward (bypassing hooks, which tracing does not support)"""
+    import torch
+
+    class EncoderForward(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, mel):
+            return type(self.encoder).forward(self.encoder, mel)
+
+    return EncoderForward()
+
+
+def _share_weights(encoder, traced):
+    """Point the eager encoder at the tensors loaded with the traced graph (no second copy in memory)"""
+    state = traced.state_dict()
+    for name, tensor in list(encoder.named_parameters()) + list(encoder.named_buffers()):
+        shared = state.get(f"encoder.{name}")
+        if shared is not None and shared.shape == tensor.shape and shared.dtype == tensor.dtype:
+            tensor.data = shared
+
+
+def _best_time(function, example, runs: int = 2) -> float:
+    import torch
+
+    best = float("inf")
+    with torch.inference_mode():
+        for _ in range(runs):
+            started = time.perf_counter()
+            function(example)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def is_compiled(model) -> bool:
+    return "forward" in vars(model.encoder)
+
+
+def uncompile_encoder(model):
+    """Go back to eager execution"""
+    if is_compiled(model):
+        del model.encoder.forward
+
+
+def compile_encoder(model, model_name: str, log: Optional[Callable[[str], None]] = None) -> Optional[float]:
+    """
+    Replace the encoder's forward with a traced graph when it is faster
+
+    The trace is saved next to the other SimpleVoice caches, keyed by model,
+    checkpoint fingerprint and machine, so tracing happens once. Inputs of any
+    other shape or dtype, and any failure, keep using the eager encoder.
+
+    Args:
+        model: Loaded Whisper model (FP32 or bf16; int8 models stay eager)
+        model_name: Model name used for the cache key
+        log: Function used to report the result
+
+    Returns:
+        Speedup of the traced encoder (None if the model stays eager)
+    """
+    import torch
+
+    log = log or print
+    if is_compiled(model):
+        return None
+    if split_model_name(model_name)[1] == "int8":
+        log(f"ℹ️ Compiled encoder is not available for int8 models: '{model_name}' stays eager")
+        return None
+
+    encoder = model.encoder
+    dtype = encoder.conv1.weight.dtype
+    example = torch.zeros(1, model.dims.n_mels, N_FRAMES, dtype=dtype)
+    eager_forward = encoder.forward
+
+    try:
+        path = artifact_path(model_name, model)
+        traced = None
+        if path.exists():
+            try:
+                traced = torch.jit.load(str(path), map_location="cpu")
+                _share_weights(encoder, traced)
+            except Exception as e:
+                log(f"⚠️ Ignoring unreadable compiled encoder {path.name}: {e}")
+                traced = None
+
+        if traced is None:
+            started = time.perf_counter()
+            with warnings.catch_warnings(), torch.inference_mode():
+                warnings.simplefilter("ignore")
+                traced = torch.jit.trace(_encoder_wrapper(encoder).eval(), example, check_trace=False)
+            log(f"⚙️ Traced encoder for '{model_name}' in {time.perf_counter() - started:.1f}s")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = path.with_suffix(".tmp")
+                torch.jit.save(traced, str(temporary))
+                os.replace(temporary, path)
+            except Exception as e:
+                log(f"⚠️ Could not cache compiled encoder: {e}")
+
+        # The first calls of a TorchScript graph are spent optimizing it
+        _best_time(traced, example, runs=2)
+        compiled_s = _best_time(traced, example)
+        eager_s = _best_time(eager_forward, example)
+
+        with torch.inference_mode():
+            expected = eager_forward(example)
+            actual = traced(example)
+        if not torch.allclose(expected.float(), actual.float(), atol=1e-3, rtol=1e-3):
+            log(f"⚠️ Compiled encoder output differs for '{model_name}': staying eager")
+            return None
+    except Exception as e:
+        log(f"⚠️ Could not compile encoder for '{model_name}': {e}")
+        return None
+
+    speedup = eager_s / compiled_s
+    if speedup <= 1.0:
+        log(f"ℹ️ Compiled encoder for '{model_name}' is not faster "
+            f"({eager_s * 1000:.0f} ms eager vs {compiled_s * 1000:.0f} ms): staying eager")
+        return None
+
+    def forward(mel):
+        if mel.shape == example.shape and mel.dtype == dtype:
+            return traced(mel)
+        return eager_forward(mel)
+
+    encoder.forward = forward
+    log(f"🚀 Compiled encoder for '{model_name}': {eager_s * 1000:.0f} ms → {compiled_s * 1000:.0f} ms "
+        f"({speedup:.2f}x)")
+    return speedup
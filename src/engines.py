@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Transcription Engines Module
+Interchangeable speech-to-text backends behind one interface
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from quantization import split_model_name
+
+# Engine used when a model does not name one
+DEFAULT_ENGINE = "whisper"
+
+# Whisper model names -> names used by the other runtimes
+_CT2_NAMES = {"large": "large-v3", "turbo": "large-v3-turbo"}
+_GGML_NAMES = {"large": "large-v3", "turbo": "large-v3-turbo"}
+
+
+class TranscriptionCancelled(Exception):
+    """Raised by `TranscriptionEngine.transcribe` when its cancel event is set"""
+
+
+def check_cancelled(cancel: Optional[threading.Event]):
+    if cancel is not None and cancel.is_set():
+        raise TranscriptionCancelled()
+
+
+class TranscriptionEngine:
+    """
+    A loaded speech-to-text model.
+
+    `transcribe` takes float32 mono audio at 16 kHz and the keyword options of
+    `whisper.transcribe` (engines translate the ones they understand and
+    ignore the rest), and returns a dict in Whisper's format:
+
+        {"text": str, "language": str | None,
+         "segments": [{"start": float, "end": float, "text": str}, ...]}
+
+    Setting the optional `cancel` event makes it raise TranscriptionCancelled
+    as soon as the runtime lets it stop.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str):
+        """
+        Args:
+            model_name: Whisper model name, optionally with a precision suffix ("-int8", "-bf16")
+        """
+        self.model_name = model_name
+        self.checkpoint, self.precision = split_model_name(model_name)
+
+    def transcribe(self, audio: np.ndarray, cancel: Optional[threading.Event] = None, **options) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the model (0 if the runtime does not tell)"""
+        return 0
+
+    def close(self):
+        """Release what the runtime holds outside this process's Python objects (e.g. a worker process)"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.model_name!r})"
+
+
+class WhisperEngine(TranscriptionEngine):
+    """Reference openai-whisper implementation (PyTorch), with the int8/bf16 variants"""
+
+    name = "whisper"
+
+    def __init__(self, model_name: str):
+        super().__init__(model_name)
+        from quantization import load_model
+        self.model = load_model(model_name)
+        self._cancel: Optional[threading.Event] = None
+        # Checked before every encoder window and every decoded token: cancelling never waits
+        # for more than one step (Whisper removes its kv-cache hooks when the exception passes)
+        self.model.encoder.register_forward_pre_hook(self._check_cancelled)
+        self.model.decoder.register_forward_pre_hook(self._check_cancelled)
+
+    def _check_cancelled(self, module, args):
+        check_cancelled(self._cancel)
+
+    def transcribe(self, audio: np.ndarray, cancel: Optional[threading.Event] = None,
+                   draft: Optional["WhisperEngine"] = None, **options) -> Dict[str, Any]:
+        """
+        Args:
+            draft: Smaller Whisper engine used for speculative decoding (same transcript, fewer
+                passes through this model's decoder); its statistics are returned under "speculation"
+        """
+        check_cancelled(cancel)
+        speculator = None
+        if draft is not None:
+            from speculative import SpeculativeDecoder
+            speculator = SpeculativeDecoder(self.model, draft.model, audio, cancel)
+            self.model.decode = speculator.decode  # whisper.transcribe decodes each window through it
+        self._cancel = cancel
+        try:
+            result = self.model.transcribe(audio, **options)
+        finally:
+            self._cancel = None
+            if speculator is not None:
+                del self.model.decode
+        if speculator is not None:
+            result["speculation"] = speculator.summary()
+        return result
+
+    def memory_bytes(self) -> int:
+        from model_manager import estimate_model_bytes
+        return estimate_model_bytes(self.model)
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """CTranslate2 runtime (faster-whisper): int8/bf16 kernels and a lighter decoder loop"""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        super().__init__(model_name)
+        from faster_whisper import WhisperModel
+
+        compute_type = {"int8": "int8", "bf16": "bfloat16"}.get(self.precision, "float32")
+        self.model = WhisperModel(
+            _CT2_NAMES.get(self.checkpoint, self.checkpoint),
+            device="cpu",
+            compute_type=compute_type,
+            cpu_threads=threads or os.cpu_count() or 0
+        )
+
+    def transcribe(self, audio: np.ndarray, cancel: Optional[threading.Event] = None, **options) -> Dict[str, Any]:
+        check_cancelled(cancel)
+        suppress_tokens = options.get("suppress_tokens", "-1")
+        if isinstance(suppress_tokens, str):
+            suppress_tokens = [int(token) for token in suppress_tokens.split(",") if token.strip()]
+
+        temperature = options.get("temperature", 0.0)
+        segments, info = self.model.transcribe(
+            audio,
+            language=options.get("language"),
+            temperature=temperature,
+            best_of=options.get("best_of") or 1,
+            beam_size=options.get("beam_size") or 1,
+            patience=options.get("patience") or 1.0,
+            length_penalty=options.get("length_penalty") or 1.0,
+            suppress_tokens=suppress_tokens,
+            initial_prompt=options.get("initial_prompt"),
+            condition_on_previous_text=options.get("condition_on_previous_text", True),
+            compression_ratio_threshold=options.get("compression_ratio_threshold", 2.4),
+            log_prob_threshold=options.get("logprob_threshold", -1.0),
+            no_speech_threshold=options.get("no_speech_threshold", 0.6),
+            vad_filter=False  # SimpleVoice already trims silence before inference
+        )
+        # `segments` is a generator: decoding happens while it is consumed, so it can stop between segments
+        collected = []
+        for segment in segments:
+            check_cancelled(cancel)
+            collected.append({"start": segment.start, "end": segment.end, "text": segment.text})
+        return {
+            "text": "".join(segment["text"] for segment in collected),
+            "language": info.language,
+            "segments": collected,
+        }
+
+
+class WhisperCppEngine(TranscriptionEngine):
+    """whisper.cpp through the pywhispercpp bindings (GGML models, q8_0 for "-int8")"""
+
+    name = "whisper.cpp"
+
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        super().__init__(model_name)
+        from pywhispercpp.model import Model
+
+        ggml_name = _GGML_NAMES.get(self.checkpoint, self.checkpoint)
+        if self.precision == "int8":
+            ggml_name += "-q8_0"
+        # bf16 has no GGML build: the default (fp16 weights) model is used
+        self.model = Model(ggml_name, n_threads=threads or os.cpu_count() or 1,
+                           print_progress=False, print_realtime=False)
+
+    def transcribe(self, audio: np.ndarray, cancel: Optional[threading.Event] = None, **options) -> Dict[str, Any]:
+        # whisper.cpp decodes the whole clip in one native call: cancelling takes effect when it returns
+        check_cancelled(cancel)
+        params = {
+            "language": options.get("language") or "auto",
+            "temperature": options.get("temperature", 0.0) or 0.0,
+            "no_context": not options.get("condition_on_previous_text", True),
+        }
+        if options.get("initial_prompt"):
+            params["initial_prompt"] = options["initial_prompt"]
+        if options.get("no_speech_threshold") is not None:
+            params["no_speech_thold"] = options["no_speech_threshold"]
+
+        # whisper.cpp timestamps are in centiseconds
+        collected = [{"start": s.t0 / 100.0, "end": s.t1 / 100.0, "text": s.text}
+                     for s in self.model.transcribe(audio.astype(np.float32, copy=False), **params)]
+        check_cancelled(cancel)
+        return {
+            "text": "".join(segment["text"] for segment in collected),
+            "language": options.get("language"),
+            "segments": collected,
+        }
+
+
+ENGINES = {
+    WhisperEngine.name: WhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+    WhisperCppEngine.name: WhisperCppEngine,
+}
+
+
+def engine_overrides() -> Dict[str, str]:
+    """
+    Engines chosen through SIMPLEVOICE_ENGINE
+
+    Either one engine for every model ("faster-whisper") or per-model choices
+    ("turbo=faster-whisper,small=whisper.cpp", "*" for the rest).
+    """
+    value = os.environ.get("SIMPLEVOICE_ENGINE", "").strip()
+    if not value:
+        return {}
+    if "=" not in value:
+        return {"*": value}
+    overrides = {}
+    for item in value.split(","):
+        model, _, engine = item.partition("=")
+        if model.strip() and engine.strip():
+            overrides[model.strip()] = engine.strip()
+    return overrides
+
+
+def parse_model_spec(spec: str) -> Tuple[str, str]:
+    """
+    Split "engine:model" into (engine, model)
+
+    Without an explicit engine, SIMPLEVOICE_ENGINE decides, then the default.
+    """
+    if ":" in spec:
+        engine, model_name = spec.split(":", 1)
+        return engine, model_name
+    overrides = engine_overrides()
+    return overrides.get(spec, overrides.get("*", DEFAULT_ENGINE)), spec
+
+
+def available_engines() -> List[str]:
+    """Engines whose runtime is installed"""
+    import importlib.util
+
+    modules = {WhisperEngine.name: "whisper", FasterWhisperEngine.name: "faster_whisper",
+               WhisperCppEngine.name: "pywhispercpp"}
+    return [name for name, module in modules.items() if importlib.util.find_spec(module) is not None]
+
+
+def create_engine(spec: str) -> TranscriptionEngine:
+    """
+    Load a model with the engine chosen for it
+
+    Args:
+        spec: "turbo", "turbo-int8", "faster-whisper:turbo", "whisper.cpp:small-int8", "worker:turbo"...
+    """
+    engine_name, model_name = parse_model_spec(spec)
+    if engine_name == "worker":
+        # "worker:<model>" runs any other spec in a separate process
+        from transcription_worker import RemoteEngine
+        return RemoteEngine(model_name)
+    engine_class = ENGINES.get(engine_name)
+    if engine_class is None:
+        raise ValueError(f"Unknown transcription engine '{engine_name}' (available: {', '.join(ENGINES)})")
+    return engine_class(model_name)
@@ -14,14 +14,16 @@ import logging
 from pathlib import Path
 from typing import Optional
 import multiprocessing
-import queue
 import time
-import pystray
-from PIL import Image, ImageDraw
 import webbrowser
 
-# Importar módulos locales
+# Importar módulos locales (recorder no importa whisper/torch hasta cargar el modelo)
 from recorder import VoiceRecorder
+import import_report
+import tray
+from quantization import split_model_name
+from engines import parse_model_spec
+from model_registry import get_registry
 
 # Configurar CustomTkinter para apariencia nativa
 ctk.set_appearance_mode("system")  # Seguir el tema del sistema
@@ -37,6 +39,11 @@ class SimpleVoiceGUI:
         self.tray_queue = multiprocessing.Queue()
         self.tray_status_queue = multiprocessing.Queue()
         self.tray_process = None
+        self.tray_state_sent = None
+        self.tray_queue_sent = 0
+        self.queue_depth = 0  # Transcripciones en cola o en curso
+        self.stopping = False  # La última grabación aún se está pasando a la cola
+        self.tray_stats = {"events": 0, "states_sent": 0, "states_coalesced": 0, "started": time.time()}
         
         # Configurar opciones de teclas disponibles (macOS-friendly)
         self.hotkey_options = {
@@ -67,7 +74,8 @@ class SimpleVoiceGUI:
         self.setup_window()
         self.setup_widgets()
         self.setup_hotkeys()
-        self.init_recorder()
+        # Cargar el modelo (y torch) cuando la ventana ya está dibujada
+        self.root.after_idle(self.init_recorder)
         
         # Configurar system tray con manejo específico para macOS (se puede desactivar con SIMPLEVOICE_NO_TRAY=1)
         if os.environ.get("SIMPLEVOICE_NO_TRAY", "0") != "1":
@@ -294,6 +302,7 @@ class SimpleVoiceGUI:
 
         # Contenido de las vistas
         self.setup_settings_section(self.settings_frame)
+        self.setup_performance_section(self.settings_frame)
         self.setup_recording_controls(self.home_frame)
         self.setup_transcription_section(self.home_frame)
         self.setup_logs_section(self.logs_frame)
@@ -317,6 +326,7 @@ This project is completely FREE and open source!
 3. Press {hotkey} again or "Stop" to finish
 4. The text is automatically transcribed
 5. It's automatically copied to clipboard
+6. Press Shift+{hotkey} or "Cancel" to abort a transcription
 
 🔧 Features:
 • Global {hotkey} hotkey (configurable)
@@ -478,6 +488,36 @@ This project is completely FREE and open source!
                 "speed": "⚡⚡⚡",
                 "accuracy": "⭐⭐⭐⭐⭐",
                 "description": "Fast and accurate (recommended)"
+            },
+            # Variantes int8: se cuantizan la primera vez y quedan en ~/.cache/simplevoice
+            "🗜️ Medium int8 - Low memory (769MB)": {
+                "model": "medium-int8",
+                "size": "769MB",
+                "speed": "⚡⚡⚡",
+                "accuracy": "⭐⭐⭐⭐",
+                "description": "Int8 weights: about 1/3 of the RAM, faster on CPU"
+            },
+            "🗜️ Turbo int8 - Low memory (805MB)": {
+                "model": "turbo-int8",
+                "size": "805MB",
+                "speed": "⚡⚡⚡⚡",
+                "accuracy": "⭐⭐⭐⭐",
+                "description": "Int8 weights: about 1/3 of the RAM, faster on CPU"
+            },
+            # Variantes bf16: la mitad de RAM en CPUs con bfloat16 nativo (si no, se usa FP32)
+            "🧮 Medium bf16 - Half memory (769MB)": {
+                "model": "medium-bf16",
+                "size": "769MB",
+                "speed": "⚡⚡⚡",
+                "accuracy": "⭐⭐⭐⭐⭐",
+                "description": "Bfloat16 weights and compute: half the RAM (FP32 fallback on older CPUs)"
+            },
+            "🧮 Turbo bf16 - Half memory (805MB)": {
+                "model": "turbo-bf16",
+                "size": "805MB",
+                "speed": "⚡⚡⚡⚡",
+                "accuracy": "⭐⭐⭐⭐⭐",
+                "description": "Bfloat16 weights and compute: half the RAM (FP32 fallback on older CPUs)"
             }
         }
 
@@ -540,6 +580,148 @@ This project is completely FREE and open source!
         self.language_dropdown.set("🌐 Auto-detect")
         self.language_dropdown.grid(row=7, column=0, pady=(0, 20), sticky="w", padx=20)
 
+    def setup_performance_section(self, parent):
+        """Configurar sección de opciones de rendimiento"""
+        performance_frame = ctk.CTkFrame(parent, corner_radius=10)
+        performance_frame.grid(row=1, column=0, sticky="new", pady=(0, 20))
+        performance_frame.grid_columnconfigure(0, weight=1)
+
+        performance_title = ctk.CTkLabel(
+            performance_frame,
+            text="Performance",
+            font=ctk.CTkFont(size=16, weight="bold")
+        )
+        performance_title.grid(row=0, column=0, pady=(15, 10), sticky="w", padx=20)
+
+        # Micrófono siempre abierto con pre-roll
+        self.warm_stream_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Keep microphone open (instant start, keeps the last 0.5s before the hotkey)",
+            font=ctk.CTkFont(size=12),
+            command=self.on_warm_stream_toggle
+        )
+        self.warm_stream_switch.grid(row=1, column=0, pady=(0, 10), sticky="w", padx=20)
+
+        # Transcripción en vivo mientras se habla
+        self.streaming_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Live transcription while speaking (only the last seconds are left to decode on stop)",
+            font=ctk.CTkFont(size=12),
+            command=self.on_streaming_toggle
+        )
+        self.streaming_switch.grid(row=2, column=0, pady=(0, 10), sticky="w", padx=20)
+
+        # Dictado continuo manos libres (segmentado por pausas)
+        self.continuous_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Hands-free continuous dictation (each pause pastes what you said)",
+            font=ctk.CTkFont(size=12)
+        )
+        self.continuous_switch.grid(row=3, column=0, pady=(0, 10), sticky="w", padx=20)
+
+        # Encoder compilado con TorchScript (se traza una vez por modelo y máquina)
+        self.compile_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Compiled encoder (traced once per model and cached; kept only if faster)",
+            font=ctk.CTkFont(size=12),
+            command=self.on_compile_toggle
+        )
+        self.compile_switch.grid(row=4, column=0, pady=(0, 10), sticky="w", padx=20)
+
+        # Carga rápida: copia FP32 mapeada en memoria de cada modelo (se convierte una vez)
+        self.fast_load_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Fast model loading (memory-mapped copy of each model, uses extra disk space)",
+            font=ctk.CTkFont(size=12),
+            command=self.on_fast_load_toggle
+        )
+        if get_registry().fast_load:
+            self.fast_load_switch.select()
+        self.fast_load_switch.grid(row=5, column=0, pady=(0, 10), sticky="w", padx=20)
+
+        # Modelo en un proceso aparte: la interfaz no compite por el GIL y un fallo del modelo no cierra la app
+        self.worker_process_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Run the model in a separate process (keeps the window responsive, restarts on crash)",
+            font=ctk.CTkFont(size=12),
+            command=self.on_worker_process_toggle
+        )
+        if os.environ.get("SIMPLEVOICE_WORKER_PROCESS", "0") == "1":
+            self.worker_process_switch.select()
+        self.worker_process_switch.grid(row=6, column=0, pady=(0, 10), sticky="w", padx=20)
+
+        # Cascada: borrador instantáneo con un modelo pequeño, refinado después por el modelo elegido
+        self.cascade_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Instant draft from a small model, refined in the background by the selected model",
+            font=ctk.CTkFont(size=12),
+            command=self.on_cascade_toggle
+        )
+        self.cascade_switch.grid(row=7, column=0, pady=(0, 10), sticky="w", padx=20)
+
+        # Decodificación especulativa: el modelo pequeño propone tokens y el elegido los verifica en bloque
+        self.speculative_switch = ctk.CTkSwitch(
+            performance_frame,
+            text="Speculative decoding (the small model proposes words, same transcript with fewer large-model passes)",
+            font=ctk.CTkFont(size=12),
+            command=self.on_speculative_toggle
+        )
+        self.speculative_switch.grid(row=8, column=0, pady=(0, 15), sticky="w", padx=20)
+
+    def on_warm_stream_toggle(self):
+        """Callback cuando se activa/desactiva el stream persistente del micrófono"""
+        enabled = self.warm_stream_switch.get() == 1
+        if hasattr(self, 'recorder') and self.recorder:
+            self.recorder.set_warm_stream(enabled)
+        else:
+            self.add_log("⚠️  Recorder not initialized yet")
+
+    def on_streaming_toggle(self):
+        """Callback cuando se activa/desactiva la transcripción en vivo"""
+        enabled = self.streaming_switch.get() == 1
+        if hasattr(self, 'recorder') and self.recorder:
+            self.recorder.set_streaming(enabled)
+        else:
+            self.add_log("⚠️  Recorder not initialized yet")
+
+    def on_compile_toggle(self):
+        """Callback cuando se activa/desactiva el encoder compilado"""
+        enabled = self.compile_switch.get() == 1
+        if hasattr(self, 'recorder') and self.recorder:
+            self.recorder.set_compile_encoder(enabled)
+        else:
+            self.add_log("⚠️  Recorder not initialized yet")
+
+    def on_fast_load_toggle(self):
+        """Callback cuando se activa/desactiva la carga mapeada en memoria (aplica a las próximas cargas)"""
+        enabled = self.fast_load_switch.get() == 1
+        get_registry().fast_load = enabled
+        self.add_log("💾 Fast model loading enabled (next model load)" if enabled else "💾 Fast model loading disabled")
+
+    def on_cascade_toggle(self):
+        """Callback cuando se activa/desactiva el borrador con el modelo pequeño"""
+        enabled = self.cascade_switch.get() == 1
+        if hasattr(self, 'recorder') and self.recorder:
+            self.recorder.set_cascade(enabled)
+        else:
+            self.add_log("⚠️  Recorder not initialized yet")
+
+    def on_speculative_toggle(self):
+        """Callback cuando se activa/desactiva la decodificación especulativa"""
+        enabled = self.speculative_switch.get() == 1
+        if hasattr(self, 'recorder') and self.recorder:
+            self.recorder.set_speculative(enabled)
+        else:
+            self.add_log("⚠️  Recorder not initialized yet")
+
+    def on_worker_process_toggle(self):
+        """Callback cuando se mueve el modelo a un proceso aparte (o de vuelta)"""
+        enabled = self.worker_process_switch.get() == 1
+        if hasattr(self, 'recorder') and self.recorder:
+            self.recorder.set_worker_process(enabled)
+        else:
+            self.add_log("⚠️  Recorder not initialized yet")
+
     def on_hotkey_change(self, selection):
         """Callback cuando se cambia la tecla seleccionada"""
         self.selected_hotkey = selection
@@ -584,10 +766,15 @@ This project is completely FREE and open source!
         
         self.add_log(f"🤖 Model changed to: {selection}")
         
-        # Verificar si el modelo está descargado
-        if self.is_model_downloaded(model_name):
+        # Verificar si el modelo está descargado (y verificado)
+        status = self.model_status(model_name)
+        if status == "installed":
             self.add_log(f"✅ Model '{model_name}' is already downloaded")
             self.load_new_model(model_name)
+        elif status == "unverified":
+            # Whisper comprueba el checksum al cargarlo y solo lo descarga de nuevo si no coincide
+            self.add_log(f"🔏 Model '{model_name}' is on disk but not verified yet: verifying...")
+            self.download_and_load_model(model_name, model_info, verifying=True)
         else:
             self.add_log(f"⬇️ Downloading model '{model_name}' ({model_info['size']})...")
             self.download_and_load_model(model_name, model_info)
@@ -601,39 +788,30 @@ This project is completely FREE and open source!
         )
         self.model_info_label.configure(text=info_text)
     
-    def is_model_downloaded(self, model_name):
-        """Verificar si un modelo está descargado"""
+    def model_status(self, model_name):
+        """
+        Estado del checkpoint de un modelo según el manifiesto del registro, sin leer el archivo:
+        "installed", "unverified" (presente pero sin verificar), "corrupt" o "missing"
+        """
+        # Las variantes int8/bf16 se generan a partir del checkpoint original
+        model_name, _ = split_model_name(parse_model_spec(model_name)[1])
         try:
-            # Verificar en el directorio de cache de whisper
-            cache_dir = os.path.expanduser("~/.cache/whisper")
-            if not os.path.exists(cache_dir):
-                return False
-                
-            # Buscar archivos del modelo en cache
-            for file in os.listdir(cache_dir):
-                if model_name in file and file.endswith('.pt'):
-                    return True
-            return False
-        except:
-            return False
+            return get_registry().status(model_name)
+        except Exception:
+            return "missing"
     
-    def download_and_load_model(self, model_name, model_info):
-        """Descargar y cargar modelo en hilo separado"""
+    def download_and_load_model(self, model_name, model_info, verifying=False):
+        """Descargar (o verificar, si ya está en disco) y cargar modelo en hilo separado"""
+        action = "🔏 Verifying" if verifying else "⬇️ Downloading"
+        
         def download_thread():
             try:
-                self.root.after(0, lambda: self.update_status(f"⬇️ Downloading {model_name}..."))
-                
-                # Descargar modelo (Whisper lo hace automáticamente)
-                import whisper
-                new_model = whisper.load_model(model_name, device="cpu")
+                self.root.after(0, lambda: self.update_status(f"{action} {model_name}..."))
                 
-                # Actualizar recorder con nuevo modelo
-                if self.recorder:
-                    self.recorder.whisper_model = new_model
-                    self.recorder.set_model(model_name)
+                # Descargar, cargar y calentar el modelo (Whisper descarga automáticamente)
+                if self.recorder and self.recorder.switch_model(model_name):
                     self.root.after(0, lambda: self.add_log(f"🚀 Model '{model_name}' loaded successfully"))
-                
-                self.root.after(0, lambda: self.update_status("🟢 Ready"))
+                    self.root.after(0, lambda: self.update_status("🟢 Ready"))
                 
             except Exception as e:
                 self.root.after(0, lambda: self.add_log(f"❌ Error downloading model '{model_name}': {e}", "ERROR"))
@@ -645,20 +823,15 @@ This project is completely FREE and open source!
         threading.Thread(target=download_thread, daemon=True).start()
     
     def load_new_model(self, model_name):
-        """Cargar modelo ya descargado"""
+        """Cargar modelo ya descargado (o reutilizarlo si sigue en memoria)"""
         def load_thread():
             try:
                 self.root.after(0, lambda: self.update_status(f"🔄 Loading {model_name}..."))
                 
-                import whisper
-                new_model = whisper.load_model(model_name, device="cpu")
-                
-                if self.recorder:
-                    self.recorder.whisper_model = new_model
-                    self.recorder.set_model(model_name)
+                # El ModelManager del recorder evita cargas duplicadas y cambia el modelo entre trabajos
+                if self.recorder and self.recorder.switch_model(model_name):
                     self.root.after(0, lambda: self.add_log(f"🚀 Model '{model_name}' loaded successfully"))
-                
-                self.root.after(0, lambda: self.update_status("🟢 Ready"))
+                    self.root.after(0, lambda: self.update_status("🟢 Ready"))
                 
             except Exception as e:
                 self.root.after(0, lambda: self.add_log(f"❌ Error loading model '{model_name}': {e}", "ERROR"))
@@ -692,22 +865,37 @@ This project is completely FREE and open source!
         )
         self.record_button.grid(row=0, column=0, pady=20, padx=20, sticky="ew")
         self._add_macos_button_fix(self.record_button)
+
+        # Cancelar la transcripción en curso y las que están en cola
+        self.cancel_button = ctk.CTkButton(
+            controls_frame,
+            text="✖️ Cancel",
+            font=ctk.CTkFont(size=14),
+            width=110,
+            height=60,
+            state="disabled",
+            command=self.cancel_transcription
+        )
+        self.cancel_button.grid(row=0, column=1, pady=20, padx=(0, 20))
+        self._add_macos_button_fix(self.cancel_button)
         
         # Instrucción
         self.instruction_label = ctk.CTkLabel(
             controls_frame,
-            text=f"Press {self.selected_hotkey} or the button to record. Speak clearly and press again to transcribe.",
+            text=f"Press {self.selected_hotkey} or the button to record. Speak clearly and press again to transcribe. "
+                 f"Shift+{self.selected_hotkey} cancels the transcription.",
             font=ctk.CTkFont(size=12),
             text_color=("gray50", "gray50"),
             wraplength=600
         )
-        self.instruction_label.grid(row=1, column=0, pady=(0, 20), padx=20)
+        self.instruction_label.grid(row=1, column=0, columnspan=2, pady=(0, 20), padx=20)
 
     def update_recording_instructions(self):
         """Actualizar las instrucciones de grabación con la tecla seleccionada"""
         if hasattr(self, 'instruction_label'):
             self.instruction_label.configure(
-                text=f"Press {self.selected_hotkey} or the button to record. Speak clearly and press again to transcribe."
+                text=f"Press {self.selected_hotkey} or the button to record. Speak clearly and press again to transcribe. "
+                     f"Shift+{self.selected_hotkey} cancels the transcription."
             )
 
     def setup_transcription_section(self, parent):
@@ -788,14 +976,14 @@ This project is completely FREE and open source!
         try:
             # Iniciar proceso separado para el system tray
             self.tray_process = multiprocessing.Process(
-                target=self.run_tray_process,
+                target=tray.run_tray_process,
                 args=(self.tray_queue, self.tray_status_queue),
                 daemon=True
             )
             self.tray_process.start()
             
-            # Iniciar monitor de eventos del tray
-            self.root.after(100, self.check_tray_events)
+            # Hilo que espera los eventos del tray (bloqueado, sin sondeo periódico)
+            threading.Thread(target=self.listen_tray_events, name="tray-events", daemon=True).start()
             
             print("✅ System tray inicializado en proceso separado")
             
@@ -804,129 +992,52 @@ This project is completely FREE and open source!
             print("📱 La aplicación funcionará sin icono en la barra de menú")
             self.tray_process = None
             
-    @staticmethod
-    def run_tray_process(event_queue, status_queue):
-        """Ejecutar system tray en proceso separado"""
-        import threading
-        try:
-            # Crear icono para el tray
-            def create_tray_icon_static(state='idle'):
-                size = 64
-                image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-                draw = ImageDraw.Draw(image)
-                
-                if state == 'recording':
-                    color = (220, 50, 50, 255)  # Rojo
-                elif state == 'processing':
-                    color = (138, 43, 226, 255) # Morado
-                else:  # 'idle'
-                    color = (50, 150, 220, 255)  # Azul
-                    
-                margin = 8
-                draw.ellipse([margin, margin, size-margin, size-margin], fill=color)
-                
-                inner_margin = 16
-                inner_color = tuple(min(255, c + 40) for c in color[:3]) + (255,)
-                draw.ellipse([inner_margin, inner_margin, size-inner_margin, size-inner_margin], fill=inner_color)
-                
-                center_margin = 24
-                center_color = (255, 255, 255, 255)
-                draw.ellipse([center_margin, center_margin, size-center_margin, size-center_margin], fill=center_color)
-                
-                return image
-            
-            # Estado del tray
-            current_state = 'idle'
-            icon = None
-            
-            def on_record_click(icon_obj, item):
-                event_queue.put(('toggle_recording',))
-                
-            def on_options_click(icon_obj, item):
-                event_queue.put(('show_window',))
-                
-            def on_quit_click(icon_obj, item):
-                event_queue.put(('quit',))
-                icon_obj.stop()
-            
-            def create_menu():
-                is_recording = current_state == 'recording'
-                is_processing = current_state == 'processing'
-                
-                if is_recording:
-                    record_text = "⏹️ Stop Recording"
-                elif is_processing:
-                    record_text = "⏳ Processing..."
-                else:
-                    record_text = "🎙️ Start Recording"
-
-                return pystray.Menu(
-                    pystray.MenuItem(record_text, on_record_click, enabled=not is_processing),
-                    pystray.MenuItem("⚙️ Options", on_options_click),
-                    pystray.Menu.SEPARATOR,
-                    pystray.MenuItem("❌ Quit", on_quit_click)
-                )
-            
-            def update_tray_state():
-                """Actualizar estado del tray basado en mensajes del proceso principal"""
-                nonlocal current_state, icon
-                try:
-                    while not status_queue.empty():
-                        status_update = status_queue.get_nowait()
-                        if status_update[0] == 'state':
-                            new_state = status_update[1]
-                            if new_state != current_state:
-                                current_state = new_state
-                                # Actualizar icono y menú
-                                icon.icon = create_tray_icon_static(current_state)
-                                icon.menu = create_menu()
-                except:
-                    pass
-            
-            # Crear y ejecutar icono
-            icon_image = create_tray_icon_static('idle')
-            icon = pystray.Icon(
-                "SimpleVoice",
-                icon_image,
-                "SimpleVoice - Voice Transcriptor",
-                create_menu()
-            )
-            
-            # Configurar verificación periódica de actualizaciones
-            def check_updates():
-                update_tray_state()
-                # Programar siguiente verificación
-                threading.Timer(0.1, check_updates).start()
-            
-            # Iniciar verificación de actualizaciones
-            check_updates()
-            
-            icon.run()
-            
-        except Exception as e:
-            print(f"⚠️ Error en proceso tray: {e}")
+    def listen_tray_events(self):
+        """Esperar los eventos del system tray y despacharlos en el hilo de Tk"""
+        while True:
+            try:
+                event = self.tray_queue.get()
+            except (EOFError, OSError, ValueError):
+                break
+            if event[0] == 'stop':
+                break
+            self.tray_stats["events"] += 1
+            self.root.after(0, self.handle_tray_event, event)
             
-    def check_tray_events(self):
-        """Verificar eventos del system tray"""
+    def handle_tray_event(self, event):
+        """Procesar un evento del system tray"""
         try:
-            while not self.tray_queue.empty():
-                event = self.tray_queue.get_nowait()
-                
-                if event[0] == 'toggle_recording':
-                    self.toggle_recording()
-                elif event[0] == 'show_window':
-                    self.show_window()
-                elif event[0] == 'quit':
-                    self.quit_application()
-                    
-        except queue.Empty:
-            pass
+            if event[0] == 'toggle_recording':
+                self.toggle_recording()
+            elif event[0] == 'cancel_transcription':
+                self.cancel_transcription()
+            elif event[0] == 'show_window':
+                self.show_window()
+            elif event[0] == 'quit':
+                self.quit_application()
+            elif event[0] == 'footprint':
+                self.log_tray_footprint(event[1])
         except Exception as e:
             print(f"⚠️ Error procesando eventos tray: {e}")
+            
+    def tray_ipc_report(self) -> str:
+        """Resumen de la comunicación con el tray (cada mensaje es un despertar; en reposo no hay ninguno)"""
+        stats = self.tray_stats
+        minutes = max((time.time() - stats["started"]) / 60, 1e-6)
+        wakeups = stats["events"] + stats["states_sent"]
+        return (f"{wakeups} wakeups in {minutes:.1f} min ({wakeups / minutes:.2f}/min): "
+                f"{stats['events']} tray events, {stats['states_sent']} state updates sent, "
+                f"{stats['states_coalesced']} coalesced")
         
-        # Programar próxima verificación
-        if self.tray_process and self.tray_process.is_alive():
-            self.root.after(100, self.check_tray_events)
+    def log_tray_footprint(self, footprint):
+        """Registrar lo que cargó el proceso del tray (nunca debería incluir torch ni whisper)"""
+        heavy = footprint.get("heavy_modules") or []
+        rss = footprint.get("rss_mb")
+        rss_text = f"{rss:.0f} MB" if rss is not None else "n/a"
+        if heavy:
+            self.add_log(f"⚠️ Tray process loaded heavy modules: {', '.join(heavy)} (RSS {rss_text})")
+        else:
+            self.add_log(f"🪶 Tray process: {footprint.get('module_count', 0)} modules, RSS {rss_text}")
         
     def hide_window(self):
         """Ocultar ventana (cerrar a system tray)"""
@@ -966,10 +1077,14 @@ This project is completely FREE and open source!
                 except:
                     pass
             
-            # Terminar proceso del system tray
+            # Terminar proceso del system tray (primero pedirle que se cierre solo)
             if self.tray_process and self.tray_process.is_alive():
-                self.tray_process.terminate()
+                print(f"📊 Tray IPC: {self.tray_ipc_report()}")
+                self.tray_status_queue.put(('stop',))
                 self.tray_process.join(timeout=1)
+                if self.tray_process.is_alive():
+                    self.tray_process.terminate()
+                    self.tray_process.join(timeout=1)
                 
             # Limpiar colas de comunicación
             try:
@@ -977,6 +1092,8 @@ This project is completely FREE and open source!
                     self.tray_queue.get_nowait()
                 while not self.tray_status_queue.empty():
                     self.tray_status_queue.get_nowait()
+                # Liberar el hilo que espera eventos del tray
+                self.tray_queue.put(('stop',))
             except:
                 pass
                 
@@ -1014,7 +1131,10 @@ This project is completely FREE and open source!
                     if hotkey_code.startswith('f') and hotkey_code[1:].isdigit():
                         expected_key = getattr(keyboard.Key, hotkey_code, None)
                         if expected_key and key == expected_key:
-                            self.root.after(0, self.toggle_recording)
+                            if self.pressed_keys & {keyboard.Key.shift, keyboard.Key.shift_l, keyboard.Key.shift_r}:
+                                self.root.after(0, self.cancel_transcription)
+                            else:
+                                self.root.after(0, self.toggle_recording)
                     
                     # Manejar combinaciones de teclas
                     elif '+' in hotkey_code:
@@ -1093,11 +1213,13 @@ This project is completely FREE and open source!
             current_modifiers = list(set(current_modifiers))  # Remove duplicates
             required_modifiers = list(set(required_modifiers))  # Remove duplicates
             
-            if set(current_modifiers) == set(required_modifiers) and has_required_key:
+            # La misma combinación con Shift cancela la transcripción
+            cancel = 'shift' not in required_modifiers and set(current_modifiers) == set(required_modifiers) | {'shift'}
+            if (set(current_modifiers) == set(required_modifiers) or cancel) and has_required_key:
                 # Pequeña pausa para evitar activaciones múltiples
                 if not hasattr(self, 'last_combination_time') or time.time() - self.last_combination_time > 0.5:
                     self.last_combination_time = time.time()
-                    self.root.after(0, self.toggle_recording)
+                    self.root.after(0, self.cancel_transcription if cancel else self.toggle_recording)
                 
         except Exception as e:
             # Manejo silencioso para evitar interrupciones
@@ -1115,52 +1237,176 @@ This project is completely FREE and open source!
                 def recorder_log_callback(message):
                     self.root.after(0, self.add_log, message, True)
 
+                # Las transcripciones parciales se muestran mientras se sigue grabando
+                def recorder_partial_callback(text):
+                    self.root.after(0, self.show_transcription, text)
+
+                # Cada frase del dictado continuo se añade al área de transcripción
+                def recorder_result_callback(text):
+                    self.root.after(0, self.append_transcription, text)
+
+                # Número de transcripciones pendientes (estado de la GUI y del tray)
+                def recorder_queue_callback(depth):
+                    self.root.after(0, self.update_queue_depth, depth)
+
                 self.recorder = VoiceRecorder(
                     log_callback=recorder_log_callback, 
                     language=selected_language,
-                    model=selected_model
+                    model=selected_model,
+                    warm_stream=self.warm_stream_switch.get() == 1,
+                    streaming=self.streaming_switch.get() == 1,
+                    compile_encoder=self.compile_switch.get() == 1,
+                    worker_process=self.worker_process_switch.get() == 1,
+                    cascade=self.cascade_switch.get() == 1,
+                    speculative=self.speculative_switch.get() == 1,
+                    partial_callback=recorder_partial_callback,
+                    result_callback=recorder_result_callback,
+                    queue_callback=recorder_queue_callback
                 )
                 self.root.after(0, lambda: self.update_status("🟢 Ready"))
+                import_report.report("recorder ready")
+
+                # Verificar en segundo plano los modelos instalados (nuevos, modificados o sin verificar hace días)
+                registry = get_registry()
+                registry.log_callback = recorder_log_callback
+                registry.verify_all_async()
+
+                # Ofrecer recuperar grabaciones de una sesión interrumpida
+                journals = self.recorder.pending_journals()
+                if journals:
+                    self.root.after(0, self.offer_journal_recovery, journals)
             except Exception as e:
                 self.root.after(0, lambda: self.add_log(f"❌ Initialization error: {e}"))
                 self.root.after(0, lambda: self.update_status("❌ Error"))
         
         threading.Thread(target=init_thread, daemon=True).start()
         
+    def offer_journal_recovery(self, journals):
+        """Preguntar si se transcriben las grabaciones que quedaron sin procesar"""
+        self.add_log(f"💾 Found {len(journals)} interrupted recording(s)")
+        if not messagebox.askyesno(
+            "SimpleVoice",
+            f"{len(journals)} recording(s) from a previous session were not transcribed.\n\nTranscribe them now?"
+        ):
+            self.add_log("ℹ️ Interrupted recordings kept for the next launch")
+            return
+
+        def recover_thread():
+            self.root.after(0, lambda: self.update_status("♻️ Recovering recordings..."))
+            for path in journals:
+                transcript = self.recorder.recover_journal(path)
+                if transcript:
+                    self.root.after(0, self.append_transcription, transcript)
+            self.root.after(0, lambda: self.update_status("🟢 Ready"))
+
+        threading.Thread(target=recover_thread, daemon=True).start()
+
     def toggle_recording(self):
         """Alternar grabación"""
         if not self.recorder:
             self.add_log("❌ Recorder not initialized")
             return
             
-        if self.recorder.is_recording:
-            # Parar grabación
+        if self.stopping:
+            # Se está copiando la grabación anterior a la cola (instantes; no bloquear la interfaz)
+            return
+
+        if self.recorder.continuous_active:
+            # Parar dictado continuo (las frases en cola se siguen transcribiendo)
             self.is_recording = False
+            self.record_button.configure(text="🎙️ Start Recording")
+            self.refresh_activity_status()
+            threading.Thread(target=self.recorder.stop_continuous, daemon=True).start()
+        elif self.recorder.is_recording:
+            # Parar grabación: el audio pasa a la cola y se puede volver a grabar enseguida
+            self.is_recording = False
+            self.stopping = True
             self.record_button.configure(text="⏳ Processing...", state="disabled")
+            self.cancel_button.configure(state="normal")
             self.update_status("⏳ Processing...")
             self.update_tray_state('processing')
             
             def stop_thread():
-                transcript = self.recorder.stop_recording()
+                transcript = self.recorder.stop_recording(
+                    background=True,
+                    result_callback=lambda text: self.root.after(0, self.show_transcription, text)
+                )
+                # Solo las grabaciones largas guardadas en disco se transcriben antes de volver
                 if transcript:
                     self.root.after(0, lambda: self.show_transcription(transcript))
-                self.root.after(0, lambda: self.record_button.configure(text="🎙️ Start Recording", state="normal"))
-                self.root.after(0, lambda: self.update_status("🟢 Ready"))
-                self.root.after(0, self.update_tray_state, 'idle')
+                self.root.after(0, self.finish_stop)
                 
             threading.Thread(target=stop_thread, daemon=True).start()
+        elif self.continuous_switch.get() == 1:
+            # Iniciar dictado continuo
+            self.continuous_text = []
+            if self.recorder.start_continuous(hotkey=self.selected_hotkey):
+                self.is_recording = True
+                self.record_button.configure(text="⏹️ Stop Dictation")
+                self.update_status("🔴 Dictating (hands-free)...")
+                self.update_tray_state('recording')
         else:
             # Iniciar grabación
             if self.recorder.start_recording(hotkey=self.selected_hotkey):
                 self.is_recording = True
                 self.record_button.configure(text="⏹️ Stop Recording")
-                self.update_status("🔴 Recording...")
-                self.update_tray_state('recording')
+                self.refresh_activity_status()
                 
+    def cancel_transcription(self):
+        """Cancelar la transcripción en curso y vaciar la cola (GUI, tray o Shift+hotkey)"""
+        if not self.recorder:
+            return
+        self.recorder.cancel_transcription()
+
+    def finish_stop(self):
+        """La grabación ya está en la cola: se puede volver a grabar"""
+        self.stopping = False
+        self.record_button.configure(text="🎙️ Start Recording", state="normal")
+        self.refresh_activity_status()
+
+    def update_queue_depth(self, depth: int):
+        """Callback del recorder cuando cambia el número de transcripciones pendientes"""
+        self.queue_depth = depth
+        self.refresh_activity_status()
+
+    def refresh_activity_status(self):
+        """Mostrar en la GUI y en el tray si se está grabando y cuántas transcripciones quedan"""
+        pending = f" ({self.queue_depth} transcribing)" if self.queue_depth else ""
+        if self.is_recording and self.recorder and self.recorder.continuous_active:
+            self.update_status(f"🔴 Dictating (hands-free)...{pending}")
+            self.update_tray_state('recording')
+        elif self.is_recording:
+            self.update_status(f"🔴 Recording...{pending}")
+            self.update_tray_state('recording')
+        elif self.queue_depth:
+            self.update_status(f"⏳ Transcribing ({self.queue_depth} queued)...")
+            self.update_tray_state('processing')
+        else:
+            self.update_status("🟢 Ready")
+            self.update_tray_state('idle')
+        self.update_tray_queue(self.queue_depth)
+        self.cancel_button.configure(state="normal" if self.queue_depth or self.stopping else "disabled")
+
+    def update_tray_queue(self, depth: int):
+        """Enviar al tray el número de transcripciones pendientes (solo si cambió)"""
+        try:
+            if self.tray_process and self.tray_process.is_alive() and depth != self.tray_queue_sent:
+                self.tray_queue_sent = depth
+                self.tray_stats["states_sent"] += 1
+                self.tray_status_queue.put(('queue', depth))
+        except Exception as e:
+            print(f"⚠️ Error actualizando cola en tray: {e}")
+
     def update_tray_state(self, state: str):
         """Enviar actualización de estado al process del tray"""
         try:
             if self.tray_process and self.tray_process.is_alive():
+                # No despertar al tray si el estado no cambió
+                if state == self.tray_state_sent:
+                    self.tray_stats["states_coalesced"] += 1
+                    return
+                self.tray_state_sent = state
+                self.tray_stats["states_sent"] += 1
                 self.tray_status_queue.put(('state', state))
         except Exception as e:
             print(f"⚠️ Error actualizando estado tray: {e}")
@@ -1173,6 +1419,13 @@ This project is completely FREE and open source!
         # Auto scroll al final
         self.transcription_text.see(tk.END)
         
+    def append_transcription(self, text):
+        """Añadir una frase del dictado continuo al área de texto"""
+        if not hasattr(self, 'continuous_text'):
+            self.continuous_text = []
+        self.continuous_text.append(text)
+        self.show_transcription(" ".join(self.continuous_text))
+        
     def copy_transcription(self):
         """Copiar transcripción al portapapeles"""
         text = self.transcription_text.get("1.0", tk.END).strip()
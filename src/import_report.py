@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Import Report Module
+Measure where startup time goes (enable with SIMPLEVOICE_IMPORT_REPORT=1)
+"""
+
+import os
+import sys
+import time
+import builtins
+import threading
+from typing import List, Tuple
+
+ENV_VAR = "SIMPLEVOICE_IMPORT_REPORT"
+
+_original_import = builtins.__import__
+_started = time.perf_counter()
+_records: List[Tuple[str, float, str]] = []  # (module, seconds including submodules, thread)
+_reported = 0
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return builtins.__import__ is _timed_import
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Only time absolute imports of modules that are not loaded yet
+    if level != 0 or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _local.depth = depth
+        if depth == 0:
+            # Nested imports are already included in the outermost one
+            with _lock:
+                _records.append((name, time.perf_counter() - start, threading.current_thread().name))
+
+
+def install(force: bool = False) -> bool:
+    """
+    Start timing imports if SIMPLEVOICE_IMPORT_REPORT=1 (or `force`)
+
+    Must run before the imports to be measured; returns True if enabled.
+    """
+    global _started
+    if not force and os.environ.get(ENV_VAR, "0") != "1":
+        return False
+    if not enabled():
+        _started = time.perf_counter()
+        builtins.__import__ = _timed_import
+    return True
+
+
+def report(label: str, top: int = 12):
+    """
+    Print the slowest imports since the previous report
+
+    Args:
+        label: Startup milestone reached (e.g. "window shown")
+        top: Number of imports listed
+    """
+    global _reported
+    if not enabled():
+        return
+
+    with _lock:
+        records = _records[_reported:]
+        _reported = len(_records)
+
+    elapsed = time.perf_counter() - _started
+    total = sum(seconds for _, seconds, _ in records)
+    print(f"⏱️ Import report — {label}: {elapsed * 1000:.0f} ms since start, "
+          f"{total * 1000:.0f} ms in {len(records)} new top-level imports")
+    for name, seconds, thread in sorted(records, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"   {seconds * 1000:8.1f} ms  {name}  [{thread}]")
@@ -19,42 +19,35 @@ else:
 
 sys.path.insert(0, str(application_path))
 
+# Medir tiempos de import antes de cargar nada más (SIMPLEVOICE_IMPORT_REPORT=1)
+import import_report
+import_report.install()
+
+import importlib.util
+
 LAST_DEP_ERROR = ""
 
+# Módulo importado -> paquete de pip que lo instala
+REQUIRED_MODULES = [
+    ("customtkinter", "customtkinter"),
+    ("pyaudio", "pyaudio"),
+    ("numpy", "numpy"),
+    ("whisper", "openai-whisper"),
+    ("pynput", "pynput"),
+    ("pyperclip", "pyperclip"),
+    ("pystray", "pystray"),
+]
+
 def check_dependencies():
-    """Verificar que todas las dependencias estén instaladas"""
+    """Verificar que todas las dependencias estén instaladas (sin importarlas: whisper arrastra torch)"""
     missing_deps = []
-    missing_tools = []
-    
-    try:
-        import customtkinter
-    except ImportError:
-        missing_deps.append("customtkinter")
     
-    try:
-        import pyaudio
-    except ImportError:
-        missing_deps.append("pyaudio")
-    
-    try:
-        import whisper
-    except ImportError:
-        missing_deps.append("openai-whisper")
-    
-    try:
-        import pynput
-    except ImportError:
-        missing_deps.append("pynput")
-    
-    try:
-        import pyperclip
-    except ImportError:
-        missing_deps.append("pyperclip")
-    
-    try:
-        import pystray
-    except ImportError:
-        missing_deps.append("pystray")
+    for module, package in REQUIRED_MODULES:
+        try:
+            if importlib.util.find_spec(module) is None:
+                missing_deps.append(package)
+        except (ImportError, ValueError):
+            missing_deps.append(package)
     
     global LAST_DEP_ERROR
     if missing_deps:
@@ -65,22 +58,6 @@ def check_dependencies():
         LAST_DEP_ERROR = "Faltan dependencias de Python: " + ", ".join(missing_deps)
         return False
 
-    # Verificar herramientas del sistema requeridas
-    try:
-        import shutil
-        if shutil.which("ffmpeg") is None:
-            missing_tools.append("ffmpeg")
-    except Exception:
-        missing_tools.append("ffmpeg")
-
-    if missing_tools:
-        print("❌ Faltan herramientas del sistema:")
-        for tool in missing_tools:
-            print(f"   - {tool}")
-        print("\n💡 En macOS instala con: brew install ffmpeg")
-        LAST_DEP_ERROR = "Faltan herramientas del sistema: " + ", ".join(missing_tools) + "\nInstala en macOS con: brew install ffmpeg"
-        return False
-    
     return True
 
 def main():
@@ -109,13 +86,12 @@ def main():
         print("🚀 Iniciando interfaz gráfica...")
         
         app = SimpleVoiceGUI()
+        if import_report.enabled():
+            app.root.after_idle(import_report.report, "window shown")
         app.run()
         
     except Exception as e:
         print(f"❌ Error iniciando aplicación: {e}")
-        # Mensaje específico si falta ffmpeg
-        if "ffmpeg" in str(e).lower():
-            print("💡 Parece que falta FFmpeg. En macOS instala con: brew install ffmpeg")
         
         # Mostrar error en GUI si es posible
         try:
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Memory-Mapped Checkpoint Module
+One-time conversion of Whisper checkpoints into a format loaded with mmap
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Optional
+
+FORMAT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def mapped_path(checkpoint: Path) -> Path:
+    """Converted copy of a checkpoint, stored next to it (shared by every process and machine using the directory)"""
+    return checkpoint.parent / "mmap" / f"{checkpoint.stem}.fp32.pt"
+
+
+def source_identity(checkpoint: Path) -> dict:
+    stat = checkpoint.stat()
+    return {"file": checkpoint.name, "size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+
+def convert(checkpoint: Path, target: Optional[Path] = None) -> Path:
+    """
+    Write an FP32 copy of a Whisper checkpoint in torch's zip format
+
+    Whisper checkpoints store FP16 tensors that are copied into FP32 parameters
+    at every load; storing them as FP32 lets the parameters point straight at
+    the mapped file.
+    """
+    import torch
+
+    target = target or mapped_path(checkpoint)
+    started = time.time()
+    source = torch.load(checkpoint, map_location="cpu", weights_only=True)
+    state = {name: tensor.float().contiguous() if tensor.is_floating_point() else tensor.contiguous()
+             for name, tensor in source["model_state_dict"].items()}
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    torch.save({
+        "format": FORMAT_VERSION,
+        "source": source_identity(checkpoint),
+        "dims": source["dims"],
+        "model_state_dict": state,
+    }, temporary)
+    os.replace(temporary, target)
+    logger.info(f"💾 Converted {checkpoint.name} for memory-mapped loading in {time.time() - started:.1f}s")
+    return target
+
+
+def empty_model(dims):
+    """Whisper model without allocated weights (they are assigned from a saved state dict)"""
+    import torch
+    from whisper.model import AudioEncoder, TextDecoder, Whisper
+
+    # Same steps as Whisper.__init__, but the layers are built on the meta device:
+    # no memory and no random initialization for weights that are replaced anyway
+    model = Whisper.__new__(Whisper)
+    torch.nn.Module.__init__(model)
+    model.dims = dims
+    with torch.device("meta"):
+        model.encoder = AudioEncoder(dims.n_mels, dims.n_audio_ctx, dims.n_audio_state,
+                                     dims.n_audio_head, dims.n_audio_layer)
+        model.decoder = TextDecoder(dims.n_vocab, dims.n_text_ctx, dims.n_text_state,
+                                    dims.n_text_head, dims.n_text_layer)
+
+    # Non-persistent buffers are not in the checkpoint: build them on the CPU
+    mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-float("inf")).triu_(1)
+    model.decoder.register_buffer("mask", mask, persistent=False)
+    all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+    all_heads[dims.n_text_layer // 2:] = True
+    model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+    return model
+
+
+def load(checkpoint: Path):
+    """
+    Load a Whisper checkpoint through its memory-mapped copy, converting it first if needed
+
+    The copy is rebuilt when the source checkpoint changes (size or modification
+    time). Parameters share the file's pages: loading takes no extra memory and
+    other processes mapping the same file reuse the page cache.
+
+    Returns:
+        The model, or None if mapping is not possible (the caller loads normally)
+    """
+    import torch
+    from whisper.model import ModelDimensions
+
+    target = mapped_path(checkpoint)
+    try:
+        mapped = torch.load(target, map_location="cpu", mmap=True, weights_only=True) if target.exists() else None
+        if mapped is None or mapped.get("format") != FORMAT_VERSION or mapped.get("source") != source_identity(checkpoint):
+            mapped = None
+            convert(checkpoint, target)
+            mapped = torch.load(target, map_location="cpu", mmap=True, weights_only=True)
+
+        model = empty_model(ModelDimensions(**mapped["dims"]))
+        model.load_state_dict(mapped["model_state_dict"], assign=True)
+    except Exception as e:
+        logger.warning(f"⚠️ Memory-mapped loading unavailable for {checkpoint.name}: {e}")
+        return None
+
+    if any(tensor.is_meta for tensor in list(model.parameters()) + list(model.buffers())):
+        logger.warning(f"⚠️ {target.name} does not cover every weight: loading {checkpoint.name} normally")
+        return None
+    return model.eval()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Model Manager Module
+LRU cache of loaded models with single-flight loading and atomic switching
+"""
+
+import gc
+import threading
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """
+    Resident size of a model's weights
+
+    Engines can report their own size with a `memory_bytes()` method; PyTorch
+    modules are measured from their state dict (this also covers packed/quantized
+    weights, which are not regular parameters).
+    """
+    if hasattr(model, "memory_bytes"):
+        return int(model.memory_bytes())
+
+    total = 0
+    seen = set()
+
+    def add(value):
+        nonlocal total
+        if hasattr(value, "element_size") and hasattr(value, "nelement"):
+            try:
+                key = value.data_ptr()
+            except Exception:
+                key = id(value)
+            if key not in seen:
+                seen.add(key)
+                total += value.element_size() * value.nelement()
+        elif isinstance(value, (tuple, list)):
+            for item in value:
+                add(item)
+
+    if hasattr(model, "state_dict"):
+        for value in model.state_dict().values():
+            add(value)
+    return total
+
+
+def _close(model: Any):
+    """Release what a dropped model holds outside Python's memory (e.g. a worker process)"""
+    close = getattr(model, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️ Error closing model: {e}")
+
+
+class ModelManager:
+    """
+    Keeps recently used models in memory up to a budget.
+
+    - `get` loads a model once even if several threads ask for it at the same time
+      (single flight), and loads are serialized so two different models never load
+      concurrently.
+    - `activate` switches the active model with a reference swap; jobs run inside
+      `acquire()` keep the model they started with until they finish.
+    - The budget covers every loaded model, the active one included. Least recently
+      used models are evicted when the total exceeds it, except the active one,
+      pinned ones and models in use by a job (which may leave the total above it).
+    """
+
+    def __init__(self, loader: Callable[[str], Any], memory_budget_mb: float = 4096.0,
+                 log_callback: Optional[Callable] = None):
+        """
+        Initialize the manager
+
+        Args:
+            loader: Function that loads a model from its key
+            memory_budget_mb: Memory allowed for all loaded models, the active one included
+            log_callback: Function used to report loads, evictions and memory
+        """
+        self.loader = loader
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.log_callback = log_callback
+        self.logger = logging.getLogger(__name__)
+
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._in_use: Dict[str, int] = {}
+        self._pinned = set()
+        self._active_key: Optional[str] = None
+        self._dropped: List[Any] = []  # Models evicted under the lock, closed once it is released
+
+        self._lock = threading.Condition()
+        self._load_lock = threading.Lock()
+        self._loading: Dict[str, threading.Event] = {}
+        self._load_errors: Dict[str, Exception] = {}
+
+    def log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            self.logger.info(message)
+
+    @property
+    def active_key(self) -> Optional[str]:
+        return self._active_key
+
+    @property
+    def active_model(self) -> Any:
+        with self._lock:
+            return self._models.get(self._active_key)
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def get(self, key: str) -> Any:
+        """
+        Return a model, loading it if needed (concurrent calls for the same key share one load)
+
+        Args:
+            key: Model key understood by the loader
+        """
+        return self._get(key)[0]
+
+    def _get(self, key: str, activate: bool = False) -> Tuple[Any, Optional[str]]:
+        """
+        `get`, optionally making the model active in the same critical section that
+        returns it (otherwise a concurrent load could evict it before it becomes active)
+
+        Returns:
+            The model and the key that was active before
+        """
+        while True:
+            with self._lock:
+                if key in self._models:
+                    return self._models[key], self._use(key, activate)
+
+                event = self._loading.get(key)
+                owner = event is None
+                if owner:
+                    event = threading.Event()
+                    self._loading[key] = event
+                    self._load_errors.pop(key, None)
+                    break
+
+            # Someone else is already loading this model: wait for their result
+            event.wait()
+            with self._lock:
+                if key in self._models:
+                    return self._models[key], self._use(key, activate)
+                if key in self._load_errors:
+                    raise self._load_errors[key]
+            # Loaded, then evicted by another load before this thread woke up: load it again
+
+        try:
+            # One load at a time: two large checkpoints in flight would double peak memory
+            with self._load_lock:
+                model = self.loader(key)
+            size = estimate_model_bytes(model)
+            with self._locked():
+                self._models[key] = model
+                self._sizes[key] = size
+                previous = self._use(key, activate)
+                self._evict_over_budget(keep=key)
+            self.log(f"📦 Model '{key}' cached ({size / 1024 / 1024:.0f} MB)")
+            return model, previous
+        except Exception as e:
+            with self._lock:
+                self._load_errors[key] = e
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            event.set()
+
+    def _use(self, key: str, activate: bool) -> Optional[str]:
+        """Mark a cached model as most recently used, and active if asked (lock held)"""
+        previous = self._active_key
+        self._models.move_to_end(key)
+        if activate:
+            self._active_key = key
+        return previous
+
+    def put(self, key: str, model: Any):
+        """Register a model loaded elsewhere (replacing the one cached under the same key)"""
+        with self._locked():
+            previous = self._models.get(key)
+            self._models[key] = model
+            self._models.move_to_end(key)
+            self._sizes[key] = estimate_model_bytes(model)
+            self._evict_over_budget(keep=key)
+        if previous is not None and previous is not model:
+            # Outside the lock: closing waits for a job still running on the old model
+            _close(previous)
+
+    def activate(self, key: str) -> Any:
+        """
+        Make a model the active one (loading it first if needed)
+
+        The swap is a single reference assignment: jobs that already acquired the
+        previous model finish with it, the next job gets the new one.
+        """
+        model, previous = self._get(key, activate=True)
+        with self._locked():
+            self._evict_over_budget()  # the previous active model can be evicted now
+        if previous != key:
+            self.log(f"🔀 Active model: '{key}'")
+        return model
+
+    @contextmanager
+    def acquire(self, key: Optional[str] = None):
+        """
+        Use a model for one job; it cannot be evicted until the job ends
+
+        Args:
+            key: Model key (default: the active model)
+        """
+        with self._lock:
+            key = key or self._active_key
+            model = self._models.get(key)
+            if model is None:
+                raise RuntimeError(f"Model '{key}' is not loaded")
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+        try:
+            yield model
+        finally:
+            with self._locked():
+                self._in_use[key] -= 1
+                if self._in_use[key] == 0:
+                    del self._in_use[key]
+                    self._evict_over_budget()
+
+    def pin(self, key: str):
+        """Never evict this model (e.g. a resident helper model)"""
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key: str):
+        with self._locked():
+            self._pinned.discard(key)
+            self._evict_over_budget()
+
+    def evict(self, key: str) -> bool:
+        """Drop a cached model if it is not active, pinned or in use"""
+        with self._locked():
+            if not self._evictable(key):
+                return False
+            self._drop(key)
+        gc.collect()
+        return True
+
+    def clear(self):
+        """Drop every model (used on shutdown)"""
+        with self._locked():
+            for key in list(self._models):
+                self._drop(key)
+            self._active_key = None
+        gc.collect()
+
+    def memory_report(self) -> Dict[str, int]:
+        """Bytes used by each cached model, most recently used last"""
+        with self._lock:
+            return {key: self._sizes.get(key, 0) for key in self._models}
+
+    def format_memory_report(self) -> str:
+        report = self.memory_report()
+        total = sum(report.values())
+        parts = [f"{key}{'*' if key == self._active_key else ''}={size / 1024 / 1024:.0f}MB"
+                 for key, size in report.items()]
+        return f"{', '.join(parts)} (total {total / 1024 / 1024:.0f}MB / budget {self.memory_budget / 1024 / 1024:.0f}MB)"
+
+    def _evictable(self, key: str, keep: Optional[str] = None) -> bool:
+        return (key in self._models and key != self._active_key and key != keep
+                and key not in self._pinned and key not in self._in_use)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the lock; models dropped meanwhile are closed after it is released
+
+        Closing a worker-process engine can take seconds: nobody should wait for
+        it just to ask whether a model is loaded.
+        """
+        try:
+            with self._lock:
+                yield
+        finally:
+            with self._lock:
+                dropped, self._dropped = self._dropped, []
+            for model in dropped:
+                _close(model)
+
+    def _drop(self, key: str):
+        """Remove a model from the cache (lock held); it is closed when `_locked` releases the lock"""
+        model = self._models.pop(key, None)
+        self._sizes.pop(key, None)
+        if model is not None:
+            self._dropped.append(model)
+
+    def _evict_over_budget(self, keep: Optional[str] = None):
+        """
+        Evict least recently used models until the cache fits the budget (lock held)
+
+        Args:
+            keep: Model just loaded for a caller, never evicted before it is returned
+        """
+        evicted = []
+        while sum(self._sizes.values()) > self.memory_budget:
+            candidate = next((key for key in self._models if self._evictable(key, keep)), None)
+            if candidate is None:
+                break
+            self._drop(candidate)
+            evicted.append(candidate)
+        for key in evicted:
+            self.log(f"🗑️  Evicted model '{key}' from memory (LRU)")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Model Registry Module
+Manifest of installed Whisper checkpoints, with background integrity checks
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+MANIFEST_NAME = "simplevoice-models.json"
+
+# Checkpoint file of each model name (the rest are "<name>.pt")
+_CHECKPOINT_FILES = {"large": "large-v3.pt", "turbo": "large-v3-turbo.pt"}
+
+# Verified checkpoints are hashed again after this long
+REVERIFY_SECONDS = 7 * 24 * 3600
+
+
+def default_model_dir() -> Path:
+    """SIMPLEVOICE_MODEL_DIR (e.g. a share used by several machines) or Whisper's own cache"""
+    configured = os.environ.get("SIMPLEVOICE_MODEL_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    cache = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return Path(cache) / "whisper"
+
+
+def checkpoint_file(name: str) -> str:
+    """File name Whisper downloads a model to (exact, so "large" never matches "large-v3-turbo")"""
+    return _CHECKPOINT_FILES.get(name, f"{name}.pt")
+
+
+def expected_sha256(name: str) -> Optional[str]:
+    """Checksum published by Whisper for a model (imports whisper: never call it from the UI thread)"""
+    import whisper
+
+    url = whisper._MODELS.get(name)
+    return url.split("/")[-2] if url else None
+
+
+def sha256_file(path: Path, chunk_size: int = 4 * 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as checkpoint:
+        while True:
+            chunk = checkpoint.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Installed models and their integrity, kept in a JSON manifest.
+
+    The manifest lives next to the checkpoints, so machines sharing a model
+    directory share it too. Answering "is this model installed?" only reads
+    the manifest and stats one file; hashing happens in `verify`, which the
+    GUI runs in the background.
+    """
+
+    def __init__(self, model_dir: Optional[str] = None, log_callback: Optional[Callable] = None):
+        """
+        Initialize the registry
+
+        Args:
+            model_dir: Checkpoint directory (default: SIMPLEVOICE_MODEL_DIR or ~/.cache/whisper)
+            log_callback: Function used to report verifications
+        """
+        self.model_dir = Path(model_dir).expanduser() if model_dir else default_model_dir()
+        self.manifest_path = self.model_dir / MANIFEST_NAME
+        self.log_callback = log_callback
+        # Load verified checkpoints through a memory-mapped FP32 copy (converted once, extra disk space)
+        self.fast_load = os.environ.get("SIMPLEVOICE_FAST_LOAD", "0") == "1"
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = self._read_manifest()
+
+    def log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            self.logger.info(message)
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as manifest:
+                return json.load(manifest).get("models", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Ignoring unreadable model manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _write_manifest(self):
+        """Save the manifest atomically (lock held); a read-only shared directory keeps it in memory"""
+        try:
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+            temporary = self.manifest_path.with_name(f".{MANIFEST_NAME}.{os.getpid()}.tmp")
+            with open(temporary, "w", encoding="utf-8") as manifest:
+                json.dump({"version": 1, "models": self._entries}, manifest, indent=2, sort_keys=True)
+            os.replace(temporary, self.manifest_path)
+        except OSError as e:
+            self.logger.debug(f"Model manifest not saved ({e})")
+
+    def path_for(self, name: str) -> Path:
+        return self.model_dir / checkpoint_file(name)
+
+    def entry(self, name: str) -> Optional[dict]:
+        """Manifest entry of a model (entries are per file, so aliases like "turbo" share one)"""
+        with self._lock:
+            entry = self._entries.get(checkpoint_file(name))
+            return dict(entry) if entry else None
+
+    def _matches_file(self, entry: Optional[dict], path: Path, status: str = "ok") -> bool:
+        """The file is still the one that was verified with this result (same size and modification time)"""
+        if not entry or entry.get("status") != status:
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return stat.st_size == entry.get("size") and int(stat.st_mtime) == entry.get("mtime")
+
+    def is_installed(self, name: str) -> bool:
+        """
+        True if the model's checkpoint was verified and has not changed since (no hashing)
+
+        A file that is present but unverified (e.g. a truncated download) does not count.
+        """
+        return self._matches_file(self.entry(name), self.path_for(name))
+
+    def status(self, name: str) -> str:
+        """
+        State of a model's checkpoint on disk (no hashing)
+
+        Returns:
+            "installed" (verified, unchanged since), "unverified" (present but not verified
+            yet, or changed since), "corrupt" (failed its verification) or "missing"
+        """
+        entry = self.entry(name)
+        path = self.path_for(name)
+        if self._matches_file(entry, path):
+            return "installed"
+        if not path.is_file():
+            return "missing"
+        if self._matches_file(entry, path, status="corrupt"):
+            return "corrupt"
+        return "unverified"
+
+    def verified_path(self, name: str) -> Optional[Path]:
+        """Checkpoint path if it can be loaded without hashing it again"""
+        path = self.path_for(name)
+        return path if self._matches_file(self.entry(name), path) else None
+
+    def installed(self) -> List[dict]:
+        """Manifest entries of the verified models"""
+        with self._lock:
+            entries = sorted(self._entries.items())
+        return [entry for file, entry in entries if self._matches_file(entry, self.model_dir / file)]
+
+    def _record(self, name: str, path: Path, sha256: Optional[str], status: str):
+        stat = path.stat()
+        with self._lock:
+            # Machines sharing the directory may have added entries meanwhile
+            self._entries = {**self._read_manifest(), **self._entries}
+            self._entries[path.name] = {
+                "model": name,
+                "size": stat.st_size,
+                "mtime": int(stat.st_mtime),
+                "sha256": sha256,
+                "status": status,
+                "verified_at": time.time(),
+            }
+            self._write_manifest()
+
+    def record_download(self, name: str, sha256: Optional[str] = None):
+        """Register a checkpoint that Whisper just downloaded (Whisper already checked its hash)"""
+        path = self.path_for(name)
+        if path.is_file():
+            self._record(name, path, sha256 or expected_sha256(name), "ok")
+
+    def verify(self, name: str) -> bool:
+        """
+        Hash a checkpoint and record the result
+
+        Returns:
+            True if the file matches Whisper's published checksum
+        """
+        path = self.path_for(name)
+        if not path.is_file():
+            with self._lock:
+                if self._entries.pop(path.name, None) is not None:
+                    self._write_manifest()
+            return False
+
+        expected = expected_sha256(name)
+        started = time.time()
+        actual = sha256_file(path)
+        ok = expected is None or actual == expected
+        self._record(name, path, actual, "ok" if ok else "corrupt")
+        if ok:
+            self.log(f"🔏 Model '{name}' verified ({path.stat().st_size / 1024 / 1024:.0f} MB "
+                     f"in {time.time() - started:.1f}s)")
+        else:
+            self.log(f"⚠️ Model '{name}' is corrupt or incomplete: it will be downloaded again when selected")
+        return ok
+
+    def needs_verification(self, name: str) -> bool:
+        entry = self.entry(name)
+        path = self.path_for(name)
+        if not path.is_file():
+            return entry is not None  # drop stale entries
+        if not self._matches_file(entry, path):
+            return True
+        return time.time() - entry.get("verified_at", 0) > REVERIFY_SECONDS
+
+    def verify_all_async(self, names: Optional[List[str]] = None) -> threading.Thread:
+        """
+        Verify, in a background thread, the checkpoints that are new, changed or due
+
+        Args:
+            names: Models to consider (default: every Whisper model)
+        """
+        def worker():
+            try:
+                candidates = names
+                if candidates is None:
+                    import whisper
+                    candidates = list(whisper._MODELS)
+                seen = set()
+                for name in candidates:
+                    file = checkpoint_file(name)
+                    if file not in seen and self.needs_verification(name):
+                        self.verify(name)
+                    seen.add(file)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Model verification failed: {e}")
+
+        thread = threading.Thread(target=worker, name="model-verify", daemon=True)
+        thread.start()
+        return thread
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """Registry of the configured model directory, shared by the whole process"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+def load_checkpoint(name: str, device: str = "cpu"):
+    """
+    Load a Whisper checkpoint from the registry's directory
+
+    Verified checkpoints load straight from their path (Whisper would hash the
+    whole file again), memory-mapped if fast loading is enabled; anything else
+    goes through Whisper's download and check, and is recorded afterwards.
+    """
+    import whisper
+
+    registry = get_registry()
+    path = registry.verified_path(name)
+    if path is not None:
+        model = None
+        if registry.fast_load and device == "cpu":
+            import mmap_checkpoint
+            model = mmap_checkpoint.load(path)
+        if model is None:
+            model = whisper.load_model(str(path), device=device)
+        if name in whisper._ALIGNMENT_HEADS:
+            model.set_alignment_heads(whisper._ALIGNMENT_HEADS[name])
+        return model
+
+    model = whisper.load_model(name, device=device, download_root=str(registry.model_dir))
+    if name in whisper._MODELS:
+        registry.record_download(name)
+    return model
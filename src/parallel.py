@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Parallel Transcription Module
+Transcribe the segments of long recordings concurrently on a pool of worker processes
+"""
+
+import os
+import logging
+import warnings
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import List, Optional
+
+import numpy as np
+
+from engines import TranscriptionCancelled
+
+logger = logging.getLogger(__name__)
+
+# How often a running job checks its cancel event
+CANCEL_POLL_SECONDS = 0.05
+
+# Memory left to the GUI process and the system when sizing the pool
+RESERVED_MEMORY_MB = 1024
+
+# Motor de transcripción cargado en cada proceso del pool (y su modelo de borradores)
+_worker_model = None
+_worker_draft = None
+_worker_cancel = None  # Event shared with the pool's owner
+
+
+def _init_worker(model_name: str, threads: int, cancel, compile_encoder: bool = False,
+                 draft_model: Optional[str] = None):
+    """
+    Load the model once per worker process, with a bounded torch thread count
+
+    The engine is set up like the app's own: same model variant and engine,
+    compiled encoder (reused from the on-disk trace cache) and draft model for
+    speculative decoding.
+    """
+    global _worker_model, _worker_draft, _worker_cancel
+
+    warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    import torch
+    from engines import WhisperEngine, create_engine
+
+    # Each worker only gets its share of the cores: N workers x T threads <= CPU count
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+    _worker_cancel = cancel
+    _worker_model = create_engine(model_name)
+    if not isinstance(_worker_model, WhisperEngine):
+        return
+    if compile_encoder:
+        import encoder_compile
+        encoder_compile.compile_encoder(_worker_model.model, model_name, logger.info)
+    if draft_model and draft_model != model_name:
+        from speculative import incompatibility
+        draft = create_engine(draft_model)
+        if isinstance(draft, WhisperEngine) and incompatibility(_worker_model.model, draft.model) is None:
+            _worker_draft = draft
+
+
+def _transcribe_segment(audio: np.ndarray, options: dict) -> str:
+    """Transcribe one segment inside a worker process"""
+    if _worker_draft is not None:
+        options = dict(options, draft=_worker_draft)
+    result = _worker_model.transcribe(audio, cancel=_worker_cancel, **options)
+    return result["text"].strip()
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Memory the system can still hand out (None if this platform does not tell)"""
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_workers(worker_bytes: Optional[int] = None, reserved_bytes: int = 0) -> int:
+    """
+    Processes this machine can afford
+
+    Half the cores, at most 4, and, when the memory of one worker is known,
+    no more copies of the model than fit in the available memory once
+    `reserved_bytes` (e.g. what the model cache may still grow into) and
+    RESERVED_MEMORY_MB are set aside. Unknown free memory means 1 (no pool).
+    """
+    workers = max(1, min(4, (os.cpu_count() or 1) // 2))
+    if worker_bytes is None:
+        return workers
+    available = available_memory_bytes()
+    if available is None or worker_bytes <= 0:
+        return 1
+    spare = available - reserved_bytes - RESERVED_MEMORY_MB * 1024 * 1024
+    return max(1, min(workers, spare // worker_bytes))
+
+
+class ParallelTranscriber:
+    """
+    Pool of worker processes, each one holding its own copy of a Whisper model.
+
+    Every worker needs the model's memory, so the pool is meant for long
+    recordings on machines with enough RAM; short clips stay on the main model.
+    A pool serves one job and is shut down afterwards.
+    """
+
+    def __init__(self, model_name: str, workers: Optional[int] = None, threads_per_worker: Optional[int] = None,
+                 compile_encoder: bool = False, draft_model: Optional[str] = None):
+        """
+        Start the pool (models load in the background, in every worker)
+
+        Args:
+            model_name: Model each worker loads (same names as `engines.create_engine`)
+            workers: Number of processes (default: half the cores, at most 4)
+            threads_per_worker: Torch threads per process (default: cores / workers)
+            compile_encoder: Use the compiled encoder in the workers, as in the app
+            draft_model: Draft model for speculative decoding in the workers (None: plain decoding)
+        """
+        cpu_count = os.cpu_count() or 1
+        self.model_name = model_name
+        self.workers = workers or default_workers()
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.workers)
+
+        # 'spawn' so workers never inherit PortAudio/Tk state from the GUI process
+        context = multiprocessing.get_context("spawn")
+        # Checked by the workers' engines: a cancelled job stops the segments already running too
+        self._cancel = context.Event()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(model_name, self.threads_per_worker, self._cancel, compile_encoder, draft_model)
+        )
+
+    def transcribe(self, segments: List[np.ndarray], options: dict,
+                   cancel: Optional[threading.Event] = None) -> List[str]:
+        """
+        Transcribe segments concurrently
+
+        Args:
+            segments: Float32 mono segments, in chronological order
+            options: Keyword arguments for `TranscriptionEngine.transcribe`
+            cancel: Event that abandons the job: segments not started are dropped and the
+                running ones stop as soon as their engine checks for cancellation
+
+        Returns:
+            The text of every segment, in the same order
+        """
+        futures = [self._executor.submit(_transcribe_segment, segment, options) for segment in segments]
+        if cancel is not None:
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=CANCEL_POLL_SECONDS)
+                if cancel.is_set():
+                    self._cancel.set()
+                    for future in futures:
+                        future.cancel()
+                    raise TranscriptionCancelled()
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
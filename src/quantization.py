@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Quantization Module
+Reduced-precision Whisper models for CPU: int8 dynamic quantization (cached on disk) and bfloat16
+"""
+
+import os
+import sys
+import time
+import platform
+import logging
+import functools
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+
+from model_registry import get_registry, load_checkpoint
+
+# Model names with these suffixes load a reduced-precision variant (e.g. "turbo-int8", "turbo-bf16")
+INT8_SUFFIX = "-int8"
+BF16_SUFFIX = "-bf16"
+
+# Layout of the int8 cache files (bump when it changes so old caches are rebuilt)
+CACHE_FORMAT_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+def split_model_name(model_name: str) -> Tuple[str, str]:
+    """
+    Separate a model name into the Whisper checkpoint and its precision
+
+    Returns:
+        (checkpoint name, "int8", "bf16" or "fp32")
+    """
+    if model_name.endswith(INT8_SUFFIX):
+        return model_name[:-len(INT8_SUFFIX)], "int8"
+    if model_name.endswith(BF16_SUFFIX):
+        return model_name[:-len(BF16_SUFFIX)], "bf16"
+    return model_name, "fp32"
+
+
+def cache_dir() -> Path:
+    """Directory of the quantized models (SIMPLEVOICE_CACHE_DIR or ~/.cache/simplevoice)"""
+    root = os.environ.get("SIMPLEVOICE_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "simplevoice")
+    return Path(root) / "quantized"
+
+
+def cache_path(checkpoint: str) -> Path:
+    """Cached int8 weights for a checkpoint (the packed int8 layout is tied to the torch version)"""
+    import torch
+
+    version = torch.__version__.split("+")[0]
+    return cache_dir() / f"{checkpoint}-int8-torch{version}.pt"
+
+
+def _select_engine():
+    """Use the int8 kernels that exist on this CPU (qnnpack on ARM, fbgemm/x86 elsewhere)"""
+    import torch
+
+    engines = torch.backends.quantized.supported_engines
+    if platform.machine().lower() in ("arm64", "aarch64") and "qnnpack" in engines:
+        torch.backends.quantized.engine = "qnnpack"
+
+
+def quantize_model(model):
+    """
+    Quantize the Linear layers of a Whisper model to int8 (dynamic activations)
+
+    Convolutions, embeddings and layer norms stay in FP32. Attention and MLP
+    projections hold almost all the weights, so they carry the memory and
+    speed gain.
+    """
+    import torch
+    import whisper.model
+
+    _select_engine()
+
+    # Whisper's Linear subclass only casts weights to the input dtype; quantize_dynamic
+    # matches exact types, so turn them back into plain nn.Linear first
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _empty_int8_model(dims):
+    """Whisper model with int8 Linear layers and no real weights (they come from a cached state dict)"""
+    import torch
+    from mmap_checkpoint import empty_model
+
+    _select_engine()
+    model = empty_model(dims)
+    # Same layers quantize_dynamic replaces; the int8 ones allocate a small zero weight
+    # instead of a full-size float one, the rest stay on the meta device until assigned
+    for parent in list(model.modules()):
+        for name, child in parent.named_children():
+            if isinstance(child, torch.nn.Linear):
+                setattr(parent, name, torch.ao.nn.quantized.dynamic.Linear(
+                    child.in_features, child.out_features, bias_=child.bias is not None, dtype=torch.qint8))
+    return model
+
+
+def _load_cached_int8(path: Path, source: dict):
+    """
+    The cached int8 model, or None if there is none or it was built from another checkpoint file
+
+    Only tensors are read (weights_only): the cache cannot run code when it is loaded.
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions
+
+    cached = torch.load(path, map_location="cpu", weights_only=True)
+    if cached.get("format") != CACHE_FORMAT_VERSION or cached.get("source") != source:
+        return None
+
+    model = _empty_int8_model(ModelDimensions(**cached["dims"]))
+    model.load_state_dict(cached["model_state_dict"], assign=True)
+    if any(tensor.is_meta for tensor in list(model.parameters()) + list(model.buffers())):
+        raise ValueError("it does not cover every weight")
+    name = source["model"]
+    if name in whisper._ALIGNMENT_HEADS:
+        model.set_alignment_heads(whisper._ALIGNMENT_HEADS[name])
+    return model.eval()
+
+
+def _source_identity(checkpoint: str) -> Optional[dict]:
+    """The checkpoint file the int8 model is built from (None if it is not on disk yet)"""
+    from mmap_checkpoint import source_identity
+
+    try:
+        return {"model": checkpoint, **source_identity(get_registry().path_for(checkpoint))}
+    except OSError:
+        return None
+
+
+def load_int8_model(checkpoint: str):
+    """
+    Load the int8 variant of a checkpoint, quantizing and caching it on first use
+
+    The cache is rebuilt when the source checkpoint changes (size or modification time).
+
+    Args:
+        checkpoint: Whisper model name (tiny, base, small, medium, large, turbo)
+    """
+    import torch
+
+    path = cache_path(checkpoint)
+    source = _source_identity(checkpoint)
+    if source is not None and path.exists():
+        try:
+            model = _load_cached_int8(path, source)
+            if model is not None:
+                return model
+            logger.info(f"🔄 {checkpoint} changed since it was quantized: rebuilding {path.name}")
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable quantized cache {path}: {e}")
+
+    started = time.time()
+    model = load_checkpoint(checkpoint)
+    model = quantize_model(model).eval()
+    logger.info(f"🗜️ Quantized '{checkpoint}' to int8 in {time.time() - started:.1f}s")
+
+    source = source or _source_identity(checkpoint)  # downloaded by load_checkpoint
+    if source is None:
+        return model
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        torch.save({
+            "format": CACHE_FORMAT_VERSION,
+            "source": source,
+            "dims": vars(model.dims),
+            "model_state_dict": model.state_dict(),
+        }, temporary)
+        os.replace(temporary, path)  # never leave a half-written cache behind
+    except Exception as e:
+        logger.warning(f"⚠️ Could not cache quantized model: {e}")
+
+    return model
+
+
+def _cpu_flags() -> Optional[set]:
+    """Instruction set flags listed in /proc/cpuinfo ("flags" on x86, "Features" on ARM), None without it"""
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            lines = cpuinfo.read().splitlines()
+    except OSError:
+        return None
+    flags = set()
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key.strip().lower() in ("flags", "features"):
+            flags.update(value.split())
+    return flags
+
+
+@functools.lru_cache(maxsize=None)
+def bf16_supported() -> bool:
+    """
+    True if this CPU has bfloat16 instructions (AVX512-BF16/AMX on x86, the BF16 extension on ARM)
+
+    oneDNN's own check (torch.ops.mkldnn._is_mkldnn_bf16_supported) is not used:
+    it also accepts AVX512 CPUs that only emulate bfloat16, slower than FP32.
+    Unknown systems (e.g. Windows) answer False, so "-bf16" models run in FP32.
+    """
+    flags = _cpu_flags()
+    if flags is not None:
+        return bool(flags & {"avx512_bf16", "amx_bf16", "bf16"})
+    if sys.platform == "darwin":
+        try:
+            output = subprocess.run(["sysctl", "-n", "hw.optional.arm.FEAT_BF16"],
+                                    capture_output=True, text=True, timeout=5).stdout
+            return output.strip() == "1"
+        except (OSError, subprocess.SubprocessError):
+            return False
+    return False
+
+
+def _cast_input(dtype, index):
+    """Forward pre-hook that casts one positional argument to `dtype`"""
+    def hook(module, args):
+        if len(args) > index and args[index].dtype != dtype:
+            args = list(args)
+            args[index] = args[index].to(dtype)
+            return tuple(args)
+    return hook
+
+
+def _float_output(module, args, output):
+    return output.float()
+
+
+def to_bf16(model):
+    """
+    Store the weights in bfloat16 and run the encoder and decoder in bfloat16
+
+    Layer norms keep FP32 weights (Whisper computes them in FP32 anyway). The
+    encoder output is handed back as FP32, because Whisper's decoding checks
+    that audio features are FP32 when fp16=False; the decoder casts them back
+    to bfloat16 on entry, and its logits are already returned as FP32.
+    """
+    import torch
+
+    model.to(torch.bfloat16)
+    for module in model.modules():
+        if isinstance(module, torch.nn.LayerNorm):
+            module.float()
+
+    model.encoder.register_forward_pre_hook(_cast_input(torch.bfloat16, 0))  # mel
+    model.encoder.register_forward_hook(_float_output)
+    model.decoder.register_forward_pre_hook(_cast_input(torch.bfloat16, 1))  # audio features
+    return model
+
+
+def load_model(model_name: str):
+    """
+    Load a Whisper model on CPU by name, including the "-int8" and "-bf16" variants
+
+    A "-bf16" model falls back to FP32 on CPUs without native bfloat16, where
+    emulated bfloat16 would be slower than FP32.
+
+    Args:
+        model_name: e.g. "turbo" (FP32), "turbo-int8" or "turbo-bf16"
+    """
+    checkpoint, precision = split_model_name(model_name)
+    if precision == "int8":
+        return load_int8_model(checkpoint)
+
+    model = load_checkpoint(checkpoint)
+    if precision == "bf16":
+        if bf16_supported():
+            return to_bf16(model)
+        logger.warning(f"⚠️ This CPU has no native bfloat16 support: '{checkpoint}' runs in FP32")
+    return model
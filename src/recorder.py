@@ -9,30 +9,46 @@ import sys
 import time
 import threading
 import logging
+import queue
 import tempfile
 import warnings
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Callable, Optional
 from datetime import datetime
-import shutil
 
 # Silenciar warnings de Whisper
 warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
 warnings.filterwarnings("ignore", category=UserWarning)
 
+# whisper (torch), pyperclip and pyautogui are imported where they are first used,
+# so importing this module does not delay the window
 try:
+    import numpy as np
     import pyaudio
-    import wave
-    import whisper
-    import pyperclip
     import subprocess
-    import pyautogui
 except ImportError as e:
     logging.error(f"❌ Error importing dependencies: {e}")
     raise
 
+from audio_buffer import AudioBuffer, JournalBuffer, RingBuffer, list_journals, open_journal, pcm16_to_float32
+from vad import SpeechSegmenter, split_at_silence, trim_silence
+from parallel import ParallelTranscriber, default_workers
+from model_manager import ModelManager
+import encoder_compile
+from engines import TranscriptionCancelled, TranscriptionEngine, WhisperEngine, create_engine
+from transcription_worker import RemoteEngine
+
 class VoiceRecorder:
-    def __init__(self, log_callback: Optional[Callable] = None, language: Optional[str] = None, model: str = "turbo"):
+    def __init__(self, log_callback: Optional[Callable] = None, language: Optional[str] = None, model: str = "turbo",
+                 capture_mode: str = "callback", warm_stream: bool = False, preroll_ms: int = 500,
+                 streaming: bool = False, partial_callback: Optional[Callable] = None, vad: bool = True,
+                 result_callback: Optional[Callable] = None, parallel_workers: Optional[int] = None,
+                 journal_threshold_mb: Optional[float] = 64.0, warm_up: bool = True,
+                 compile_encoder: bool = False, worker_process: bool = False,
+                 queue_callback: Optional[Callable] = None, cascade: bool = False,
+                 draft_model: Optional[str] = None, speculative: bool = False):
         """
         Initialize the voice recorder
         
@@ -40,15 +56,101 @@ class VoiceRecorder:
             log_callback: Function to send logs to the GUI
             language: Language code for transcription (e.g., "es", "en") or None for auto-detect (default)
             model: Whisper model to use (tiny, base, small, medium, large, turbo)
+            capture_mode: "callback" (PortAudio thread, with overflow accounting) or "blocking" (read loop)
+            warm_stream: Keep the input stream open between recordings (instant start with pre-roll)
+            preroll_ms: Audio kept from just before the hotkey press while the stream is warm
+            streaming: Transcribe while the user is still speaking (live partial results)
+            partial_callback: Function receiving partial transcriptions while streaming
+            vad: Trim silence and skip clips without speech before running Whisper
+            result_callback: Function receiving each transcript produced in the background (continuous mode)
+            parallel_workers: Processes used for long recordings: 1 = disabled, 0 = as many as cores and
+                free memory allow, N = at most N (default: SIMPLEVOICE_PARALLEL_WORKERS or 1)
+            journal_threshold_mb: RAM used by a recording before it spills to a memory-mapped journal
+                (None keeps everything in RAM)
+            warm_up: Decode a short synthetic clip right after loading a model
+            compile_encoder: Run the encoder as a TorchScript graph (traced once per model and machine, cached on disk)
+            worker_process: Run the model in a separate long-lived process (audio is passed through shared memory)
+            queue_callback: Function receiving the number of pending transcription jobs whenever it changes
+            cascade: Paste a draft from a small resident model first, then refine it with `model` in the background
+            draft_model: Model used for drafts (default: SIMPLEVOICE_DRAFT_MODEL or "base")
+            speculative: Let the draft model propose tokens that `model` verifies in batches (same transcript)
         """
         self.is_recording = False
         self.sample_rate = 16000
         self.chunk_size = 1024
+        self.max_chunk_size = 8192  # Upper bound for adaptive frames_per_buffer
         self.channels = 1
+        self.capture_mode = capture_mode
+        self.capture_stats = {"overruns": 0, "dropped_frames": 0, "callbacks": 0}
+        self._capture_done = threading.Event()
+        self._expected_adc_time = None
+        self._capture_lock = threading.Lock()
+        self._warm_stream = None
+        self._warm_stream_chunk_size = None
+        self.warm_stream = False
+        self.preroll = RingBuffer(int(self.sample_rate * preroll_ms / 1000) * self.channels)
+        self.streaming = streaming
+        self.partial_callback = partial_callback
+        self.stream_interval = 1.5  # Seconds between live decoding passes
+        self.stream_min_window = 1.0  # Do not decode less audio than this
+        self.stream_max_window = 30.0  # Whisper's native window
+        self.stream_holdback = 4.0  # Keep the last seconds tentative: words there may still change
+        self._stream_thread = None
+        self._stream_stop = threading.Event()  # Set when the recording being streamed stops
+        self._stream_lock = threading.Lock()  # A partial commits whole, or not at all once stopped
+        self._committed_samples = 0
+        self._committed_text = []
+        self._model_lock = threading.Lock()
+        self._engine_locks = weakref.WeakKeyDictionary()  # One lock per engine: a draft never waits for a refinement
+        self.vad_enabled = vad
+        self.result_callback = result_callback
+        self.continuous_active = False
+        self.segment_poll_interval = 0.1  # Seconds between VAD passes in continuous mode
+        self._segmenter = None
+        self._segment_thread = None
+        self._job_queue = queue.Queue()
+        self._job_thread = None
+        self.queue_callback = queue_callback
+        self.cascade = False
+        self.draft_model = draft_model or os.environ.get("SIMPLEVOICE_DRAFT_MODEL", "base")
+        self.speculative = False
+        self._speculation_warned = set()  # (model, draft) pairs already reported as incompatible
+        self._refine_queue = queue.Queue()
+        self._refine_thread = None
+        self._recording_seq = 0  # Recordings delivered so far: only the latest draft may be replaced
+        self._handoff_lock = threading.Lock()  # A new recording waits until the last one left the buffer
+        self._cancel_lock = threading.Lock()
+        self._running_jobs = set()  # Cancel events of the transcriptions in progress
+        self._cancel_requested_at = None
+        self.cancel_stats = {"cancelled": 0, "last_ms": None, "max_ms": 0.0}
+        if parallel_workers is None:
+            parallel_workers = int(os.environ.get("SIMPLEVOICE_PARALLEL_WORKERS", "1"))
+        self.parallel_workers = parallel_workers  # Every worker holds its own copy of the model: opt-in
+        self.parallel_min_seconds = 120.0  # Shorter recordings stay on the main model
+        self.parallel_segment_seconds = 30.0
+        self._parallel_pool = None
+        self.warm_up = warm_up
+        self.compile_encoder = compile_encoder
+        self._compile_tried = weakref.WeakSet()  # Engines already compiled, or whose trace was declined
+        self.worker_process = worker_process
         self.temp_dir = tempfile.mkdtemp()
-        self.whisper_model = None
+        # Caché de modelos compartida con la GUI (presupuesto configurable por variable de entorno)
+        self.model_manager = ModelManager(
+            loader=self._load_model,
+            memory_budget_mb=float(os.environ.get("SIMPLEVOICE_MODEL_CACHE_MB", "4096")),
+            log_callback=self.log
+        )
+        self._switch_generation = 0
+        self._switch_lock = threading.Lock()  # Guards the generation from the increment to the activation
         self.recording_thread = None
-        self.audio_data = []
+        # Journal en una ruta estable para poder recuperarlo tras reiniciar la app
+        self.journal_dir = os.path.join(tempfile.gettempdir(), "SimpleVoice", "journal")
+        self.journal_block_seconds = 300.0  # Audio converted to float32 at once when reading a journal
+        if journal_threshold_mb is None:
+            self.audio_buffer = AudioBuffer(sample_rate=self.sample_rate, channels=self.channels)
+        else:
+            self.audio_buffer = JournalBuffer(self.journal_dir, spill_threshold_mb=journal_threshold_mb,
+                                              sample_rate=self.sample_rate, channels=self.channels)
         self.start_time = None
         self.log_callback = log_callback
         self.language = language  # Language for transcription
@@ -60,12 +162,6 @@ class VoiceRecorder:
         self.log("🎙️  Initializing SimpleVoice...")
         self.log(f"📁 Temporary directory: {self.temp_dir}")
         
-        # Verificar ffmpeg (requerido por whisper para carga/decodificación)
-        if shutil.which("ffmpeg") is None:
-            error_msg = "FFmpeg is not installed or not found in PATH. Install with 'brew install ffmpeg' on macOS."
-            self.log(f"❌ {error_msg}", "ERROR")
-            raise RuntimeError(error_msg)
-
         # Inicializar PyAudio
         self.audio = pyaudio.PyAudio()
         self.log("🎤 PyAudio initialized")
@@ -73,6 +169,16 @@ class VoiceRecorder:
         # Cargar modelo Whisper
         self.load_whisper_model()
         
+        # Abrir el stream persistente si se solicitó
+        if warm_stream:
+            self.set_warm_stream(True)
+        
+        # Cargar en segundo plano el modelo de borradores
+        if cascade:
+            self.set_cascade(True)
+        if speculative:
+            self.set_speculative(True)
+        
         # Registrar configuración
         lang_text = "🌐 Auto-detect" if language is None else f"🌍 {language.upper()}"
         self.log(f"🗣️  Language configured: {lang_text}")
@@ -100,14 +206,172 @@ class VoiceRecorder:
         try:
             self.log(f"🤖 Loading Whisper model '{self.model_name}'...")
             self.send_notification("Initializing...", f"Initializing model, please wait a few seconds...")
-            self.whisper_model = whisper.load_model(self.model_name, device="cpu")
-            self.log(f"✅ Whisper model '{self.model_name}' loaded successfully")
+            self.model_manager.activate(self.model_name)
             self.send_notification("Ready to Record", "SimpleVoice is now ready to use.")
         except Exception as e:
             self.log(f"❌ Error loading Whisper model '{self.model_name}': {e}", "ERROR")
             self.send_notification("Initialization Error", f"Could not load model: {e}")
             raise
     
+    def _load_model(self, model_name: str):
+        """Model loader used by the model manager: create the model's engine, compile and warm it up"""
+        started = time.time()
+        if self.worker_process:
+            engine = RemoteEngine(model_name, log_callback=self.log)
+        else:
+            engine = create_engine(model_name)
+        self.log(f"✅ Whisper model '{model_name}' loaded successfully with {engine.name} ({time.time() - started:.1f}s)")
+        if self.compile_encoder:
+            self._compile_engine(engine, model_name)
+        if self.warm_up:
+            self.warm_up_model(engine)
+        return engine
+    
+    def _compile_engine(self, engine: TranscriptionEngine, model_name: str):
+        """
+        Compile the encoder of a PyTorch Whisper engine (other runtimes are already compiled code)
+        
+        Each engine is tried once: a trace that was not faster or did not match
+        is not traced and benchmarked again every time the model is selected.
+        The engine lock is held, so the benchmark does not compete with a
+        transcription and the encoder is never swapped under a running decode.
+        """
+        if not isinstance(engine, WhisperEngine):
+            return
+        with self._engine_lock(engine):
+            if engine in self._compile_tried:
+                return
+            self._compile_tried.add(engine)
+            encoder_compile.compile_encoder(engine.model, model_name, self.log)
+    
+    @property
+    def engine(self) -> Optional[TranscriptionEngine]:
+        """Active transcription engine"""
+        return self.model_manager.active_model
+    
+    def switch_model(self, model_name: str) -> bool:
+        """
+        Load (or reuse from the cache) a model and make it the active one
+        
+        If another switch is requested while this one is loading, only the latest
+        request becomes active.
+        
+        Args:
+            model_name: Model name (tiny, base, small, medium, large, turbo), with "-int8" or "-bf16"
+                for reduced precision and an optional engine prefix ("faster-whisper:turbo")
+        
+        Returns:
+            True if the model is now active, False if a newer switch superseded it
+        """
+        with self._switch_lock:
+            self._switch_generation += 1
+            generation = self._switch_generation
+        
+        if self.model_manager.is_loaded(model_name):
+            self.log(f"♻️  Model '{model_name}' reused from memory")
+        else:
+            self.log(f"🤖 Loading Whisper model '{model_name}'...")
+        engine = self.model_manager.get(model_name)
+        if self.compile_encoder:
+            self._compile_engine(engine, model_name)
+        
+        with self._switch_lock:
+            # Compared and activated together: a newer switch cannot finish in between
+            if generation != self._switch_generation:
+                self.log(f"⏭️  Model '{model_name}' loaded but a newer selection was made; keeping it cached")
+                return False
+            self.model_manager.activate(model_name)
+            self.set_model(model_name)
+        self.log(f"🧠 Models in memory: {self.model_manager.format_memory_report()}")
+        return True
+    
+    def set_compile_encoder(self, enabled: bool):
+        """
+        Enable or disable the compiled encoder for the active model (and the next loads)
+        
+        Tracing can take a while the first time, so it runs in the background,
+        after the transcription in progress (if any); the model keeps working
+        eagerly until the compiled encoder is ready.
+        """
+        self.compile_encoder = enabled
+        engine = self.engine
+        if not isinstance(engine, WhisperEngine):
+            return
+        if not enabled:
+            def uncompile():
+                # Waits for a running transcription instead of switching encoders under it
+                with self._engine_lock(engine):
+                    encoder_compile.uncompile_encoder(engine.model)
+                    self._compile_tried.discard(engine)  # Enabling it again traces once more
+                self.log("🐢 Compiled encoder disabled")
+            
+            threading.Thread(target=uncompile, daemon=True).start()
+            return
+        
+        threading.Thread(
+            target=self._compile_engine,
+            args=(engine, self.model_name),
+            daemon=True
+        ).start()
+    
+    def set_worker_process(self, enabled: bool):
+        """
+        Move the active model into a worker process, or back into this one
+
+        The replacement loads in the background; transcriptions keep using the
+        current engine until it is ready. Other cached models switch when they
+        are loaded again.
+        """
+        if enabled == self.worker_process:
+            return
+        self.worker_process = enabled
+        self.log("🧩 Model runs in a worker process" if enabled else "🧩 Model runs in the app process")
+
+        def reload():
+            model_name = self.model_name
+            try:
+                for key in list(self.model_manager.memory_report()):
+                    if key != model_name:
+                        self.model_manager.evict(key)
+                self.model_manager.put(model_name, self._load_model(model_name))
+                self.log(f"🧠 Models in memory: {self.model_manager.format_memory_report()}")
+            except Exception as e:
+                self.log(f"❌ Error reloading model '{model_name}': {e}", "ERROR")
+
+        threading.Thread(target=reload, daemon=True).start()
+
+    def restart_worker(self):
+        """Start the active model's worker process again (e.g. after it misbehaved)"""
+        engine = self.engine
+        if isinstance(engine, RemoteEngine):
+            engine.restart()
+
+    def warm_up_model(self, engine: Optional[TranscriptionEngine] = None):
+        """
+        Decode a short synthetic clip so the first real dictation does not pay for
+        lazy allocations, thread-pool start-up and cold caches
+        
+        Args:
+            engine: Engine to warm up (default: the active one)
+        """
+        engine = engine or self.engine
+        
+        # 1 s chirp at moderate level: exercises the encoder, language detection and the decoder
+        t = np.arange(self.sample_rate, dtype=np.float32) / self.sample_rate
+        clip = (0.1 * np.sin(2 * np.pi * (200 + 600 * t) * t)).astype(np.float32)
+        
+        try:
+            self.log("🔥 Warming up model...")
+            timings = []
+            for _ in range(2):
+                started = time.time()
+                with self._engine_lock(engine):
+                    engine.transcribe(clip, **self.decode_options())
+                timings.append(time.time() - started)
+            self.log(f"🔥 Warm-up done: cold pass {timings[0]:.2f}s, warm pass {timings[1]:.2f}s")
+        except Exception as e:
+            self.log(f"⚠️  Model warm-up failed: {e}", "WARNING")
+    
     def set_language(self, language_code: Optional[str]):
         """
         Change the transcription language
@@ -138,49 +402,515 @@ class VoiceRecorder:
             
         self.log("🎵 STARTING RECORDING...")
         
-        # Start notification
-        self.send_notification("🎤 Recording", f"Speak now! Press {hotkey} to stop", 2)
-        
-        self.is_recording = True
-        self.audio_data = []
+        with self._handoff_lock:
+            # Start notification
+            self.send_notification("🎤 Recording", f"Speak now! Press {hotkey} to stop", 2)
+            
+            if self.warm_stream and self._ensure_warm_stream():
+                # The stream is already running: switch the callback from pre-roll to recording
+                with self._capture_lock:
+                    self._reset_capture()
+                    preroll = self.preroll.read()
+                    self.audio_buffer.append(preroll)
+                    self.preroll.clear()
+                    self.is_recording = True
+                self.recording_thread = None
+                self.log(f"⏪ Pre-roll added: {len(preroll) / float(self.sample_rate * self.channels):.2f}s")
+            else:
+                self._reset_capture()
+                self.is_recording = True
+            
+                # Start recording in separate thread
+                self.recording_thread = threading.Thread(target=self._record_audio)
+                self.recording_thread.start()
+            
+            if self.streaming and not self.continuous_active:
+                self._start_streaming()
+            
+            return True
+    
+    def _reset_capture(self):
+        """Prepare buffer and statistics for a new recording"""
+        self.audio_buffer.clear(release=True)
+        self.capture_stats = {"overruns": 0, "dropped_frames": 0, "callbacks": 0}
+        self._capture_done.clear()
+        self._expected_adc_time = None
         self.start_time = time.time()
         
-        # Start recording in separate thread
-        self.recording_thread = threading.Thread(target=self._record_audio)
-        self.recording_thread.start()
+    def stop_recording(self, background: bool = False, result_callback: Optional[Callable] = None):
+        """
+        Stop recording and process audio
         
-        return True
+        Args:
+            background: Queue the audio for transcription and return at once, so a new
+                recording can start while this one is transcribed (results are pasted in order)
+            result_callback: Function receiving the transcript of a queued recording
         
-    def stop_recording(self):
-        """Stop recording and process audio"""
+        Returns:
+            The transcript, or None if there is none or the recording was queued
+        """
         if not self.is_recording:
             self.log("⚠️  Not recording", "WARNING")
             return None
+        
+        if self.continuous_active:
+            self.stop_continuous()
+            return None
             
         self.log("🛑 STOPPING RECORDING...")
-        self.is_recording = False
+        
+        # Processing notification
+        self.send_notification("🤖 Processing", "Transcribing audio...", 3)
+        
+        with self._handoff_lock:
+            self._stop_capture()
+            
+            # Process recorded audio
+            if len(self.audio_buffer) == 0:
+                self.log("⚠️  No audio to process", "WARNING")
+                return None
+            # Recordings spilled to a journal are too long to copy: they are transcribed from disk right away
+            if background and not self.audio_buffer.spilled:
+                self._queue_recording(result_callback)
+                return None
+            return self._process_audio()
+    
+    def _queue_recording(self, result_callback: Optional[Callable]):
+        """Copy what is left to transcribe out of the buffer and hand it to the job worker"""
+        if self.streaming:
+            committed_text, samples = self._stream_tail()
+            prefix = list(committed_text)
+            audio = pcm16_to_float32(samples, self.channels) if self._tail_to_decode(committed_text, samples) else None
+        else:
+            prefix = []
+            audio = self.audio_buffer.to_float32()
+        self._submit_job(audio, prefix=prefix, recording=True, callback=result_callback)
+        self.log(f"📥 Recording queued for transcription ({self.queue_depth} pending)")
+    
+    def _stop_capture(self):
+        """Stop the capture of the current recording and wait until the last chunk is stored"""
+        with self._capture_lock:
+            self.is_recording = False
+        self._capture_done.set()
+        self._stream_stop.set()
         
         # Calculate recording duration
         if self.start_time:
             duration = time.time() - self.start_time
             self.log(f"⏹️  Recording finished ({duration:.1f}s)")
         
-        # Processing notification
-        self.send_notification("🤖 Processing", "Transcribing audio...", 3)
-        
         # Wait for recording thread to finish
         if self.recording_thread:
             self.recording_thread.join()
+        
+        self._report_capture_stats()
+        
+        # Reopen the warm stream if frames_per_buffer was raised
+        if self.warm_stream:
+            self._ensure_warm_stream()
+    
+    def start_continuous(self, hotkey: str = "F12"):
+        """
+        Start hands-free dictation: the microphone stays open, utterances are cut
+        at pauses and each one is transcribed and pasted while capture continues
+        """
+        if self.capture_mode != "callback":
+            self.log("⚠️  Continuous dictation requires callback capture mode", "WARNING")
+            return False
+        
+        self.continuous_active = True
+        if not self.start_recording(hotkey=hotkey):
+            self.continuous_active = False
+            return False
+        
+        self.log("🔁 Continuous dictation started")
+        self._segmenter = SpeechSegmenter(sample_rate=self.sample_rate)
+        self._segment_thread = threading.Thread(target=self._segment_worker, daemon=True)
+        self._segment_thread.start()
+        return True
+    
+    def stop_continuous(self):
+        """Stop hands-free dictation; utterances already queued are still transcribed"""
+        if not self.continuous_active:
+            return
+        
+        self.log("🛑 STOPPING CONTINUOUS DICTATION...")
+        with self._handoff_lock:
+            self._stop_capture()
+            if self._segment_thread:
+                self._segment_thread.join()
+                self._segment_thread = None
+            self.continuous_active = False
+        self.log("🔁 Continuous dictation stopped")
+    
+    def _segment_worker(self):
+        """Cut the live capture into utterances and queue them for transcription"""
+        channels = self.channels
+        base = 0  # Absolute (mono) index of the first sample still in the buffer
+        read_pos = 0  # Absolute (mono) index of the next sample to feed to the VAD
+        
+        while True:
+            done = self._capture_done.wait(self.segment_poll_interval)
             
-        # Process recorded audio
-        if len(self.audio_data) > 0:
-            return self._process_audio()
-        else:
-            self.log("⚠️  No audio to process", "WARNING")
-            return None
+            view = self.audio_buffer.view()
+            new = view[(read_pos - base) * channels:]
+            read_pos += len(new) // channels
+            segments = self._segmenter.feed(pcm16_to_float32(new, channels))
+            if done:
+                last = self._segmenter.flush()
+                if last:
+                    segments.append(last)
+            
+            for start, end in segments:
+                audio = pcm16_to_float32(view[(start - base) * channels:(end - base) * channels], channels)
+                self.log(f"✂️  Utterance detected ({len(audio) / float(self.sample_rate):.1f}s), queued for transcription")
+                self._submit_job(audio)
+            
+            if done:
+                break
+            
+            # Bound memory: forget audio that can no longer belong to an utterance
+            keep_from = self._segmenter.keep_from
+            if keep_from - base >= self.sample_rate * 5:
+                self.audio_buffer.discard((keep_from - base) * channels)
+                base = keep_from
+    
+    @property
+    def queue_depth(self) -> int:
+        """Transcription jobs queued or running (refinements of drafts included)"""
+        return self._job_queue.unfinished_tasks + self._refine_queue.unfinished_tasks
+    
+    def _notify_queue_depth(self):
+        if self.queue_callback:
+            self.queue_callback(self.queue_depth)
+    
+    def _submit_job(self, audio: Optional["np.ndarray"], prefix: Optional[list] = None, recording: bool = False,
+                    callback: Optional[Callable] = None):
+        """
+        Queue audio for the background transcription worker
+        
+        Args:
+            audio: Float32 audio still to transcribe (None if only `prefix` is left)
+            prefix: Text already transcribed for this job (live transcription)
+            recording: A whole push-to-talk recording rather than a continuous-mode utterance
+            callback: Function receiving the transcript (default: `result_callback`)
+        """
+        self._job_queue.put((audio, prefix or [], recording, callback or self.result_callback))
+        if self._job_thread is None or not self._job_thread.is_alive():
+            self._job_thread = threading.Thread(target=self._job_worker, daemon=True)
+            self._job_thread.start()
+        self._notify_queue_depth()
+    
+    def _job_worker(self):
+        """Transcribe queued jobs in order and paste each one as soon as it is ready"""
+        while True:
+            job = self._job_queue.get()
+            if job is None:
+                break
+            audio, prefix, recording, callback = job
+            draft = recording and self._draft_ready()
+            try:
+                texts = list(prefix)
+                speech = self._apply_vad(audio) if audio is not None else None
+                if speech is not None:
+                    with self._cancellable() as cancel:
+                        if draft:
+                            # Cascade: the small resident model answers now, the selected one refines later
+                            texts.append(self._transcribe(speech, cancel, self.draft_model)["text"].strip())
+                        elif recording:
+                            texts.append(self._transcribe_recording(speech, cancel))
+                        else:
+                            texts.append(self._transcribe(speech, cancel)["text"].strip())
+                transcript = " ".join(text for text in texts if text)
+                if recording:
+                    self._recording_seq += 1
+                if draft and speech is not None:
+                    self._submit_refine(speech, prefix, transcript, callback, self._recording_seq)
+                if not transcript:
+                    continue
+                self.log(f"📝 {'Draft' if draft else 'Transcription'}: {transcript}")
+                if recording:
+                    self._deliver_transcript(transcript)
+                else:
+                    # Keep consecutive utterances separated in the target application
+                    self._deliver_transcript(transcript + " ", notify=False)
+                if callback:
+                    callback(transcript)
+            except TranscriptionCancelled:
+                self._report_cancelled()
+            except Exception as e:
+                self.log(f"❌ Error processing {'recording' if recording else 'utterance'}: {e}", "ERROR")
+            finally:
+                # The loop keeps its variables alive until the next job: free the audio now
+                job = audio = speech = None
+                self._job_queue.task_done()
+                self._notify_queue_depth()
+    
+    def set_cascade(self, enabled: bool, draft_model: Optional[str] = None):
+        """
+        Enable or disable two-pass transcription of recordings
+        
+        The draft model is pinned in the model manager, so switching the main
+        model never evicts it. It loads in the background; recordings are
+        transcribed in a single pass until it is ready.
+        
+        Args:
+            enabled: True to paste drafts and refine them
+            draft_model: Model used for drafts (default: keep the current one)
+        """
+        if draft_model and draft_model != self.draft_model:
+            self.model_manager.unpin(self.draft_model)
+            self.draft_model = draft_model
+        self.cascade = enabled
+        if not enabled:
+            self._release_draft_model()
+            self.log("📝 Draft transcription disabled")
+            return
+        
+        self._load_draft_model(lambda: f"📝 Draft model '{self.draft_model}' ready: recordings are pasted "
+                                       f"as drafts and refined by '{self.model_name}'")
+    
+    def set_speculative(self, enabled: bool):
+        """
+        Enable or disable speculative decoding with the draft model
+        
+        The draft model proposes a few tokens at a time and the selected model
+        checks them in one decoder pass, keeping only what it would have chosen
+        itself: transcripts do not change, the large decoder runs fewer times.
+        It applies when both models run on the in-process Whisper engine, with
+        greedy decoding (SimpleVoice's default options).
+        
+        Args:
+            enabled: True to draft tokens with `draft_model`
+        """
+        self.speculative = enabled
+        if not enabled:
+            self._release_draft_model()
+            self.log("⚡ Speculative decoding disabled")
+            return
+        
+        self._load_draft_model(lambda: f"⚡ Speculative decoding ready: '{self.draft_model}' drafts "
+                                       f"tokens for '{self.model_name}'")
+    
+    def _load_draft_model(self, ready_message: Callable[[], str]):
+        """Pin the draft model and load it in the background"""
+        self.model_manager.pin(self.draft_model)
+        
+        def load_draft_model():
+            try:
+                if not self.model_manager.is_loaded(self.draft_model):
+                    self.log(f"📝 Loading draft model '{self.draft_model}'...")
+                self.model_manager.get(self.draft_model)
+                self.log(ready_message())
+            except Exception as e:
+                self.log(f"❌ Error loading draft model '{self.draft_model}': {e}", "ERROR")
+        
+        threading.Thread(target=load_draft_model, daemon=True).start()
+    
+    def _release_draft_model(self):
+        """Let the draft model be evicted once neither drafts nor speculative decoding use it"""
+        if not (self.cascade or self.speculative):
+            self.model_manager.unpin(self.draft_model)
+    
+    def _draft_ready(self) -> bool:
+        """Cascade is on, the draft model is loaded and it is not the selected model itself"""
+        return (self.cascade and self.draft_model != self.model_name
+                and self.model_manager.is_loaded(self.draft_model))
+    
+    def _submit_refine(self, speech: "np.ndarray", prefix: list, draft: str, callback: Optional[Callable], seq: int):
+        """Queue the second pass of a drafted recording"""
+        self._refine_queue.put((speech, list(prefix), draft, callback, seq))
+        if self._refine_thread is None or not self._refine_thread.is_alive():
+            self._refine_thread = threading.Thread(target=self._refine_worker, daemon=True)
+            self._refine_thread.start()
+        self._notify_queue_depth()
+    
+    def _refine_worker(self):
+        """
+        Re-transcribe drafted recordings with the selected model
+        
+        When the text differs, the refined version replaces the draft in the
+        clipboard and in the GUI (the draft already pasted is left as it is),
+        unless a newer recording was delivered meanwhile. Runs beside the job
+        worker so new drafts do not wait for refinements.
+        """
+        while True:
+            job = self._refine_queue.get()
+            if job is None:
+                break
+            speech, prefix, draft, callback, seq = job
+            try:
+                started = time.time()
+                with self._cancellable() as cancel:
+                    texts = list(prefix) + [self._transcribe_recording(speech, cancel)]
+                refined = " ".join(text for text in texts if text)
+                if not refined or refined == draft:
+                    self.log(f"✅ Draft confirmed by '{self.model_name}' ({time.time() - started:.1f}s)")
+                    continue
+                self.log(f"✨ Refined by '{self.model_name}' ({time.time() - started:.1f}s): {refined}")
+                if seq != self._recording_seq:
+                    self.log("ℹ️  A newer dictation was delivered meanwhile: its text stays in the clipboard")
+                    continue
+                try:
+                    import pyperclip
+                    pyperclip.copy(refined)
+                    self.log("📋 Refined text copied to clipboard")
+                except Exception as e:
+                    self.log(f"❌ Error copying to clipboard: {e}", "ERROR")
+                self.send_notification("✨ Refined", f"Better transcription copied: {refined[:50]}...")
+                if callback:
+                    callback(refined)
+            except TranscriptionCancelled:
+                self._report_cancelled()
+            except Exception as e:
+                self.log(f"❌ Error refining transcription: {e}", "ERROR")
+            finally:
+                job = speech = None
+                self._refine_queue.task_done()
+                self._notify_queue_depth()
     
     def _record_audio(self):
         """Record audio continuously"""
+        if self.capture_mode == "callback":
+            self._record_audio_callback()
+        else:
+            self._record_audio_blocking()
+    
+    def _record_audio_callback(self):
+        """Record audio from PortAudio's own thread until the recording is stopped"""
+        try:
+            stream = self._open_callback_stream()
+            
+            # Nothing to do on this thread: the callback fills the buffer
+            self._capture_done.wait()
+            
+            stream.stop_stream()
+            stream.close()
+            
+        except Exception as e:
+            self.log(f"❌ Error during recording: {e}", "ERROR")
+            self.is_recording = False
+    
+    def _open_callback_stream(self):
+        """Open an input stream that delivers audio through `_audio_callback`"""
+        return self.audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._audio_callback
+        )
+    
+    def set_warm_stream(self, enabled: bool):
+        """
+        Keep the microphone stream open between recordings
+        
+        Args:
+            enabled: True to open the persistent stream, False to close it
+        """
+        if enabled and self.capture_mode != "callback":
+            self.log("⚠️  Warm stream requires callback capture mode", "WARNING")
+            return
+        
+        self.warm_stream = enabled
+        if enabled:
+            if self._ensure_warm_stream():
+                self.log(f"🔥 Warm input stream enabled ({self.preroll_seconds:.1f}s pre-roll)")
+        else:
+            self._close_warm_stream()
+            self.log("🧊 Warm input stream disabled")
+    
+    @property
+    def preroll_seconds(self) -> float:
+        """Pre-roll length in seconds"""
+        return self.preroll.capacity / float(self.sample_rate * self.channels)
+    
+    def _ensure_warm_stream(self) -> bool:
+        """Open (or reopen) the persistent stream if needed. Returns True if it is running"""
+        stream = self._warm_stream
+        if stream is not None and stream.is_active() and self._warm_stream_chunk_size == self.chunk_size:
+            return True
+        
+        if self.is_recording and stream is not None:
+            # Never swap the stream in the middle of a recording
+            return stream.is_active()
+        
+        self._close_warm_stream()
+        try:
+            self.preroll.clear()
+            self._expected_adc_time = None
+            self._warm_stream = self._open_callback_stream()
+            self._warm_stream_chunk_size = self.chunk_size
+            return True
+        except Exception as e:
+            self.log(f"⚠️  Could not open warm input stream, falling back to on-demand capture: {e}", "WARNING")
+            self._warm_stream = None
+            return False
+    
+    def _close_warm_stream(self):
+        """Stop and close the persistent stream if it is open"""
+        stream = self._warm_stream
+        self._warm_stream = None
+        self._warm_stream_chunk_size = None
+        if stream is not None:
+            try:
+                stream.stop_stream()
+                stream.close()
+            except Exception as e:
+                self.log(f"⚠️  Error closing warm input stream: {e}", "WARNING")
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status_flags):
+        """PyAudio stream callback: store the chunk and account for overflows"""
+        stats = self.capture_stats
+        stats["callbacks"] += 1
+        
+        if status_flags & pyaudio.paInputOverflow:
+            stats["overruns"] += 1
+        
+        # A jump in the ADC timestamps means PortAudio discarded frames before handing them to us
+        adc_time = time_info.get("input_buffer_adc_time", 0.0) if time_info else 0.0
+        if adc_time > 0:
+            if self._expected_adc_time is not None:
+                missing = int(round((adc_time - self._expected_adc_time) * self.sample_rate))
+                if missing > frame_count // 2:
+                    stats["dropped_frames"] += missing
+            self._expected_adc_time = adc_time + frame_count / float(self.sample_rate)
+        
+        with self._capture_lock:
+            if self.is_recording:
+                self.audio_buffer.append(in_data)
+            else:
+                # Warm stream idling: keep only the latest pre-roll
+                self.preroll.write(in_data)
+        return (None, pyaudio.paContinue)
+    
+    def _report_capture_stats(self):
+        """Log overruns of the last recording and enlarge frames_per_buffer if the machine could not keep up"""
+        if self.capture_mode != "callback":
+            return
+        
+        stats = self.capture_stats
+        if stats["overruns"] == 0 and stats["dropped_frames"] == 0:
+            return
+        
+        dropped_seconds = stats["dropped_frames"] / float(self.sample_rate)
+        self.log(
+            f"⚠️  Audio overruns: {stats['overruns']} in {stats['callbacks']} buffers "
+            f"(~{stats['dropped_frames']} frames / {dropped_seconds:.2f}s lost)",
+            "WARNING"
+        )
+        
+        if self.chunk_size < self.max_chunk_size:
+            self.chunk_size = min(self.chunk_size * 2, self.max_chunk_size)
+            self.log(f"📈 Raising frames_per_buffer to {self.chunk_size} for the next recording")
+    
+    def get_capture_stats(self) -> dict:
+        """Capture statistics of the last recording"""
+        return dict(self.capture_stats, frames_per_buffer=self.chunk_size, capture_mode=self.capture_mode)
+    
+    def _record_audio_blocking(self):
+        """Record audio with a blocking read loop"""
         try:
             # Configure audio stream
             stream = self.audio.open(
@@ -193,9 +923,9 @@ class VoiceRecorder:
             
             while self.is_recording:
                 try:
-                    # Read audio chunk
+                    # Read audio chunk straight into the preallocated buffer
                     data = stream.read(self.chunk_size, exception_on_overflow=False)
-                    self.audio_data.append(data)
+                    self.audio_buffer.append(data)
                 except Exception as e:
                     self.log(f"⚠️  Error reading audio: {e}", "WARNING")
                     break
@@ -211,69 +941,478 @@ class VoiceRecorder:
     def _process_audio(self):
         """Process recorded audio with Whisper"""
         try:
-            if not self.audio_data:
+            if len(self.audio_buffer) == 0:
                 self.log("⚠️  No audio data to process", "WARNING")
                 return None
             
-            # Combine all audio chunks
-            audio_bytes = b''.join(self.audio_data)
-            
-            # Save temporary audio as WAV
-            temp_file = os.path.join(self.temp_dir, "temp_audio.wav")
-            
-            with wave.open(temp_file, 'wb') as wav_file:
-                wav_file.setnchannels(self.channels)
-                wav_file.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
-                wav_file.setframerate(self.sample_rate)
-                wav_file.writeframes(audio_bytes)
-            
-            # Transcribe with Whisper
-            self.log("🤖 Transcribing with Whisper...")
-            
-            result = self.whisper_model.transcribe(
-                temp_file,
-                language=self.language,
-                fp16=False,
-                verbose=False,
-                temperature=0.0,
-                best_of=1,
-                beam_size=1,
-                patience=1.0,
-                length_penalty=1.0,
-                suppress_tokens="-1",  # keep default suppression (e.g., [Music], [Laughter])
-                initial_prompt=None,
-                condition_on_previous_text=False,
-                compression_ratio_threshold=2.4,
-                logprob_threshold=-1.0,
-                no_speech_threshold=0.7
-            )
+            with self._cancellable() as cancel:
+                if self.streaming:
+                    # Most of the recording was already decoded while speaking: only the tail is left
+                    committed_text, samples = self._stream_tail()
+                    tail_seconds = len(samples) / float(self.sample_rate * self.channels)
+                    self.log(f"🤖 Transcribing remaining {tail_seconds:.1f}s with Whisper...")
+                    texts = list(committed_text)
+                    if self._tail_to_decode(committed_text, samples):
+                        tail = self._apply_vad(pcm16_to_float32(samples, self.channels))
+                        if tail is not None:
+                            texts.append(self._transcribe(tail, cancel)["text"].strip())
+                    transcript = " ".join(t for t in texts if t)
+                elif self.audio_buffer.spilled:
+                    # Meeting-length recording on disk: decode it block by block from the mapped journal
+                    transcript = self._transcribe_long(self.audio_buffer.view(), cancel)
+                else:
+                    # Convert the captured samples in memory (no WAV file, no ffmpeg)
+                    audio = self._apply_vad(self.audio_buffer.to_float32())
+                    transcript = "" if audio is None else self._transcribe_recording(audio, cancel)
             
-            transcript = result["text"].strip()
+            # The recording is safely transcribed: its journal is no longer needed
+            if self.audio_buffer.spilled:
+                self.audio_buffer.remove_journal()
+            
+            if not transcript:
+                return None
             
             self.log(f"📝 Transcription: {transcript}")
+            self._deliver_transcript(transcript)
+            
+            return transcript
+        except TranscriptionCancelled:
+            # A cancelled recording is not worth recovering: drop its journal too
+            if self.audio_buffer.spilled:
+                self.audio_buffer.remove_journal()
+            self._report_cancelled()
+            return None
+        except Exception as e:
+            self.log(f"❌ Error processing audio: {e}", "ERROR")
+            if self.audio_buffer.spilled:
+                self.log(f"💾 Recording kept for recovery: {self.audio_buffer.path}", "WARNING")
+            return None
+    
+    def _transcribe_recording(self, audio: "np.ndarray", cancel: Optional[threading.Event] = None) -> str:
+        """Transcribe a whole (VAD-trimmed) recording"""
+        if self.parallel_workers != 1 and len(audio) >= self.parallel_min_seconds * self.sample_rate:
+            # Long dictation: use every core the memory allows
+            return self._transcribe_parallel(audio, cancel)
+        # Transcribe with Whisper
+        self.log("🤖 Transcribing with Whisper...")
+        return self._transcribe(audio, cancel)["text"].strip()
+    
+    def _transcribe_long(self, samples: "np.ndarray", cancel: Optional[threading.Event] = None) -> str:
+        """
+        Transcribe int16 samples (possibly a memmap) without converting them all at once
+        
+        Blocks of `journal_block_seconds` are converted to float32 one at a time and
+        split at pauses; the last piece of each block is carried into the next one so
+        no word is cut at a block boundary.
+        
+        Args:
+            samples: Interleaved int16 samples
+            cancel: Event that aborts the transcription (TranscriptionCancelled)
+        """
+        channels = self.channels
+        block = int(self.journal_block_seconds * self.sample_rate) * channels
+        total = len(samples)
+        self.log(f"🤖 Transcribing {total / float(self.sample_rate * channels):.0f}s recording from the journal...")
+        
+        texts = []
+        position = 0
+        while position < total:
+            end = min(total, position + block)
+            audio = pcm16_to_float32(samples[position:end], channels)
+            bounds = split_at_silence(audio, self.sample_rate, max_segment_s=self.parallel_segment_seconds)
+            if end < total and len(bounds) > 1:
+                bounds = bounds[:-1]
+            
+            pieces = [self._apply_vad(audio[start:stop]) for start, stop in bounds]
+            texts.extend(self._transcribe_pieces([piece for piece in pieces if piece is not None], cancel))
+            position += bounds[-1][1] * channels
+        
+        return " ".join(text for text in texts if text)
+    
+    def pending_journals(self) -> list:
+        """Journals left by recordings that were never transcribed (e.g. after a crash)"""
+        current = getattr(self.audio_buffer, "path", None)
+        return [path for path in list_journals(self.journal_dir) if path != current]
+    
+    def recover_journal(self, path) -> Optional[str]:
+        """
+        Transcribe the recording of an interrupted session and delete its journal
+        
+        Args:
+            path: Journal file returned by `pending_journals`
+        """
+        try:
+            samples, sample_rate, channels = open_journal(path)
+            if sample_rate != self.sample_rate or channels != self.channels:
+                self.log(f"⚠️  Journal {path} has an unsupported format ({sample_rate} Hz, {channels} ch)", "WARNING")
+                return None
             
-            # Copy to clipboard and auto-paste
+            self.log(f"♻️  Recovering interrupted recording: {path}")
+            with self._cancellable() as cancel:
+                transcript = self._transcribe_long(samples, cancel) if len(samples) else ""
+            del samples
+            os.remove(path)
+            self.log(f"📝 Recovered transcription: {transcript}")
+            return transcript or None
+        except TranscriptionCancelled:
+            self._report_cancelled()
+            self.log(f"💾 Interrupted recording kept for the next launch: {path}")
+            return None
+        except Exception as e:
+            self.log(f"❌ Error recovering journal {path}: {e}", "ERROR")
+            return None
+    
+    def _apply_vad(self, audio: "np.ndarray") -> Optional["np.ndarray"]:
+        """
+        Remove non-speech audio before inference
+        
+        Returns:
+            The speech audio, or None when the clip contains no speech at all
+        """
+        if not self.vad_enabled:
+            return audio
+        
+        speech, removed = trim_silence(audio, self.sample_rate)
+        if len(speech) == 0:
+            self.log(f"🔇 No speech detected in {removed:.1f}s of audio, skipping transcription")
+            return None
+        
+        if removed > 0:
+            self.log(f"✂️  VAD removed {removed:.1f}s of silence")
+        return speech
+    
+    def _transcribe(self, audio: "np.ndarray", cancel: Optional[threading.Event] = None,
+                    model_name: Optional[str] = None) -> dict:
+        """
+        Run an engine on a float32 mono array with SimpleVoice's decoding options
+        
+        Args:
+            audio: Normalized float32 samples at 16 kHz
+            cancel: Event that aborts the transcription (TranscriptionCancelled)
+            model_name: Loaded model to use (default: the active one)
+        
+        Returns:
+            Whisper-style result: {"text", "language", "segments": [{"start", "end", "text"}]}
+        """
+        with self.model_manager.acquire(model_name) as engine, self._engine_lock(engine):
+            if self._speculation_ready(engine):
+                # The draft is only read (no lock): a draft job can use it at the same time
+                with self.model_manager.acquire(self.draft_model) as draft:
+                    if self._can_draft_for(engine, draft):
+                        result = engine.transcribe(audio, cancel=cancel, draft=draft, **self.decode_options())
+                        self._report_speculation(engine, result.get("speculation"))
+                        return result
+            return engine.transcribe(audio, cancel=cancel, **self.decode_options())
+    
+    def _speculation_ready(self, engine: TranscriptionEngine) -> bool:
+        """Speculative decoding is on, the draft model is loaded and `engine` is not the draft itself"""
+        return (self.speculative and isinstance(engine, WhisperEngine)
+                and engine.model_name != self.draft_model
+                and self.model_manager.is_loaded(self.draft_model))
+    
+    def _can_draft_for(self, engine: TranscriptionEngine, draft: TranscriptionEngine) -> bool:
+        """True if `draft` can propose tokens to `engine` (an incompatible pair is reported once)"""
+        if not isinstance(draft, WhisperEngine):
+            return False
+        from speculative import incompatibility
+        reason = incompatibility(engine.model, draft.model)
+        if reason is None:
+            return True
+        if (engine.model_name, draft.model_name) not in self._speculation_warned:
+            self._speculation_warned.add((engine.model_name, draft.model_name))
+            self.log(f"⚠️  '{draft.model_name}' cannot draft for '{engine.model_name}' ({reason}): "
+                     f"decoding normally", "WARNING")
+        return False
+    
+    def _report_speculation(self, engine: TranscriptionEngine, stats: Optional[dict]):
+        if not stats or not stats["passes"]:
+            return
+        self.log(f"⚡ Speculative decoding: {stats['acceptance']:.0%} of {stats['drafted']} drafted tokens "
+                 f"accepted, {stats['tokens_per_pass']:.1f} tokens per '{engine.model_name}' pass")
+    
+    def _engine_lock(self, engine: TranscriptionEngine) -> threading.Lock:
+        """Lock serializing the calls to one engine (models are not safe to run twice at once)"""
+        with self._model_lock:
+            lock = self._engine_locks.get(engine)
+            if lock is None:
+                lock = self._engine_locks[engine] = threading.Lock()
+            return lock
+    
+    @contextmanager
+    def _cancellable(self):
+        """Cancel event of one transcription job, set by `cancel_transcription`"""
+        cancel = threading.Event()
+        with self._cancel_lock:
+            self._running_jobs.add(cancel)
+        try:
+            yield cancel
+        finally:
+            with self._cancel_lock:
+                self._running_jobs.discard(cancel)
+    
+    def cancel_transcription(self) -> bool:
+        """
+        Abort the transcription in progress and drop the queued ones
+        
+        Whisper stops before its next decoded token, faster-whisper before its next
+        segment; the model is free again as soon as the running job unwinds.
+        
+        Returns:
+            True if there was something to cancel
+        """
+        self._cancel_requested_at = time.perf_counter()
+        dropped = self._drain(self._job_queue) + self._drain(self._refine_queue)
+        
+        with self._cancel_lock:
+            running = list(self._running_jobs)
+        for cancel in running:
+            cancel.set()
+        
+        if not running and not dropped:
+            self.log("ℹ️  Nothing to cancel")
+            return False
+        self.log(f"🛑 Cancelling transcription ({len(running)} running, {dropped} queued dropped)...")
+        self._notify_queue_depth()
+        return True
+    
+    @staticmethod
+    def _drain(jobs: queue.Queue) -> int:
+        """Drop the queued jobs (a shutdown sentinel stays queued); returns how many were dropped"""
+        dropped = 0
+        stop = False
+        while True:
             try:
-                pyperclip.copy(transcript)
-                self.log("📋 Text copied to clipboard")
+                job = jobs.get_nowait()
+            except queue.Empty:
+                break
+            jobs.task_done()
+            if job is None:
+                stop = True
+            else:
+                dropped += 1
+        if stop:
+            jobs.put(None)
+        return dropped
+    
+    def _report_cancelled(self):
+        """Log how long the cancelled job took to release the model"""
+        self.cancel_stats["cancelled"] += 1
+        if self._cancel_requested_at is None:
+            self.log("🛑 Transcription cancelled")
+            return
+        latency_ms = (time.perf_counter() - self._cancel_requested_at) * 1000
+        self.cancel_stats["last_ms"] = latency_ms
+        self.cancel_stats["max_ms"] = max(self.cancel_stats["max_ms"], latency_ms)
+        self.log(f"🛑 Transcription cancelled in {latency_ms:.0f} ms "
+                 f"(worst so far {self.cancel_stats['max_ms']:.0f} ms)")
+    
+    def decode_options(self) -> dict:
+        """Keyword arguments for `TranscriptionEngine.transcribe` (Whisper's option names)"""
+        return dict(
+            language=self.language,
+            fp16=False,
+            verbose=False,
+            temperature=0.0,
+            best_of=1,
+            beam_size=1,
+            patience=1.0,
+            length_penalty=1.0,
+            suppress_tokens="-1",  # keep default suppression (e.g., [Music], [Laughter])
+            initial_prompt=None,
+            condition_on_previous_text=False,
+            compression_ratio_threshold=2.4,
+            logprob_threshold=-1.0,
+            no_speech_threshold=0.7
+        )
+    
+    def _transcribe_parallel(self, audio: "np.ndarray", cancel: Optional[threading.Event] = None) -> str:
+        """
+        Split a long recording at pauses and transcribe the pieces concurrently
+        
+        Args:
+            audio: Normalized float32 samples at 16 kHz
+        """
+        bounds = split_at_silence(audio, self.sample_rate, max_segment_s=self.parallel_segment_seconds)
+        texts = self._transcribe_pieces([audio[start:end] for start, end in bounds], cancel)
+        return " ".join(text for text in texts if text)
+    
+    def _transcribe_pieces(self, pieces: list, cancel: Optional[threading.Event] = None) -> list:
+        """Transcribe independent pieces in order, on the process pool when it is worth it"""
+        if not pieces:
+            return []
+        
+        workers = self._parallel_workers() if len(pieces) > 1 else 1
+        if workers == 1:
+            return [self._transcribe(piece, cancel)["text"].strip() for piece in pieces]
+        
+        # A pool per job: the model copies are freed as soon as the recording is done
+        draft_model = self.draft_model if self.speculative else None
+        self.log(f"🧩 Starting {workers} transcription processes for '{self.model_name}' (each one loads the model)")
+        pool = ParallelTranscriber(self.model_name, workers=workers, compile_encoder=self.compile_encoder,
+                                   draft_model=draft_model)
+        self._parallel_pool = pool
+        try:
+            self.log(f"🧩 Transcribing {len(pieces)} segments on {pool.workers} processes "
+                     f"({pool.threads_per_worker} threads each)...")
+            started = time.time()
+            texts = pool.transcribe(pieces, self.decode_options(), cancel)
+            self.log(f"🧩 Parallel transcription finished in {time.time() - started:.1f}s")
+            return texts
+        finally:
+            self._parallel_pool = None
+            pool.shutdown()
+    
+    def _parallel_workers(self) -> int:
+        """
+        Processes to use for a long recording (1 = transcribe on the loaded model)
+        
+        Capped by cores and by the model copies that fit in free memory once the
+        model cache's budget headroom is set aside (the workers are not part of
+        the cache, so its budget cannot bound them).
+        """
+        if self.parallel_workers == 1:
+            return 1
+        sizes = self.model_manager.memory_report()
+        worker_bytes = sizes.get(self.model_name, 0)
+        if self.speculative:
+            worker_bytes += sizes.get(self.draft_model, 0)
+        headroom = max(0, self.model_manager.memory_budget - sum(sizes.values()))
+        workers = default_workers(worker_bytes, reserved_bytes=headroom)
+        if self.parallel_workers > 1:
+            workers = min(workers, self.parallel_workers)
+        if workers == 1:
+            self.log("ℹ️  Not enough cores or free memory for parallel transcription: using the loaded model")
+        return workers
+    
+    def _deliver_transcript(self, transcript: str, notify: bool = True):
+        """Copy the transcript to the clipboard, paste it and notify"""
+        try:
+            import pyperclip
+            pyperclip.copy(transcript)
+            self.log("📋 Text copied to clipboard")
 
-                # Auto-paste from clipboard
-                self._paste_from_clipboard()
-                
-            except Exception as e:
-                self.log(f"❌ Error copying to clipboard or pasting: {e}", "ERROR")
+            # Auto-paste from clipboard
+            self._paste_from_clipboard()
+            
+        except Exception as e:
+            self.log(f"❌ Error copying to clipboard or pasting: {e}", "ERROR")
 
-            # Send notification
+        # Send notification
+        if notify:
             self.send_notification("📋 Ready!", f"Transcription copied: {transcript[:50]}...")
+    
+    def set_streaming(self, enabled: bool):
+        """
+        Enable or disable live partial transcription while recording
+        
+        Args:
+            enabled: True to decode the growing recording in the background
+        """
+        self.streaming = enabled
+        self.log(f"📡 Live transcription {'enabled' if enabled else 'disabled'}")
+    
+    def _start_streaming(self):
+        """Reset the streaming state and start the background decoder for a new recording"""
+        stop = threading.Event()
+        with self._stream_lock:
+            self._stream_stop = stop
+            self._committed_samples = 0
+            self._committed_text = []
+        self._stream_thread = threading.Thread(target=self._stream_worker, args=(stop,), daemon=True)
+        self._stream_thread.start()
+    
+    def _stream_worker(self, stop: threading.Event):
+        """Decode sliding windows of the growing recording until it is stopped"""
+        while not stop.wait(self.stream_interval):
+            try:
+                self._decode_partial(stop)
+            except TranscriptionCancelled:
+                break
+            except Exception as e:
+                self.log(f"⚠️  Error during live transcription: {e}", "WARNING")
+    
+    def _decode_partial(self, stop: threading.Event):
+        """
+        Decode the audio after the committed point and emit a partial hypothesis.
+        
+        Segments that end well before the live edge (and are followed by another
+        segment) are committed: their text is final and the next window starts
+        after them, so overlapping windows never repeat words. The rest is shown
+        as a tentative tail that the next pass may still revise.
+        
+        Args:
+            stop: Set when the recording stops; a decode still running is then
+                cancelled and its result dropped (the tail starts at the last commit)
+        """
+        samples_per_second = self.sample_rate * self.channels
+        view = self.audio_buffer.view()
+        start = self._committed_samples
+        end = min(len(view), start + int(self.stream_max_window * samples_per_second))
+        window_seconds = (end - start) / float(samples_per_second)
+        if window_seconds < self.stream_min_window:
+            return
+        
+        result = self._transcribe(pcm16_to_float32(view[start:end], self.channels), stop)
+        segments = result.get("segments", [])
+        
+        commit_limit = window_seconds - self.stream_holdback
+        with self._stream_lock:
+            if stop.is_set():
+                return
+            committed_until = 0.0
+            tentative = []
+            for index, segment in enumerate(segments):
+                text = segment["text"].strip()
+                is_last = index == len(segments) - 1
+                if not tentative and not is_last and segment["end"] <= commit_limit:
+                    if text:
+                        self._committed_text.append(text)
+                    committed_until = segment["end"]
+                elif text:
+                    tentative.append(text)
             
-            return transcript
-        except Exception as e:
-            self.log(f"❌ Error processing audio: {e}", "ERROR")
-            return None
+            if committed_until > 0:
+                offset = int(committed_until * self.sample_rate) * self.channels
+                self._committed_samples = start + offset
+            partial = " ".join(self._committed_text + tentative)
+        
+        self._emit_partial(partial)
+    
+    def _stream_tail(self):
+        """
+        Stop the background decoder and return (committed texts, samples still to decode)
+        
+        The decoder is not joined: a partial decode may be waiting for the engine behind
+        queued jobs. It is cancelled instead, and whatever it had not committed yet is
+        left in the tail.
+        """
+        self._stream_stop.set()
+        self._stream_thread = None
+        with self._stream_lock:
+            return list(self._committed_text), self.audio_buffer.view()[self._committed_samples:]
+    
+    def _tail_to_decode(self, committed_text: list, samples: "np.ndarray") -> bool:
+        """
+        True if the tail left by the live decoder must be transcribed
+        
+        A tail shorter than the minimum window is skipped after committed text, but not
+        when nothing was committed: then it is the whole utterance (a short "yes"), and
+        the VAD decides whether it holds speech.
+        """
+        if len(samples) == 0:
+            return False
+        return not committed_text or len(samples) >= self.stream_min_window * self.sample_rate * self.channels
+    
+    def _emit_partial(self, text: str):
+        """Send a partial hypothesis to the GUI"""
+        if self.partial_callback and text:
+            self.partial_callback(text)
 
     def _paste_from_clipboard(self):
         """Simulate pasting from clipboard using pyautogui with a more robust method."""
         try:
+            import pyautogui
+            
             self.log("📋 Pasting text automatically...")
             
             # Allow a very short moment for the user to switch focus if needed
@@ -314,6 +1453,15 @@ class VoiceRecorder:
     def cleanup(self):
         """Clean up resources"""
         try:
+            if self._job_thread and self._job_thread.is_alive():
+                self._job_queue.put(None)
+            if self._refine_thread and self._refine_thread.is_alive():
+                self._refine_queue.put(None)
+            if self._parallel_pool is not None:
+                self._parallel_pool.shutdown()
+                self._parallel_pool = None
+            self._close_warm_stream()
+            self.model_manager.clear()
             if self.audio:
                 self.audio.terminate()
             
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Speculative Decoding Module
+A small Whisper model drafts tokens that the selected model verifies in one pass
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from whisper.audio import N_FRAMES, N_SAMPLES, log_mel_spectrogram, pad_or_trim
+from whisper.decoding import DecodingTask, decode
+from whisper.model import SDPA_AVAILABLE, MultiHeadAttention
+from whisper.tokenizer import get_tokenizer
+
+from engines import check_cancelled
+
+# Tokens drafted before the selected model checks them
+DEFAULT_DRAFT_TOKENS = 4
+
+
+def incompatibility(model, draft) -> Optional[str]:
+    """Why `draft` cannot draft for `model` (None if it can: both multilingual, same text vocabulary)"""
+    if not (model.is_multilingual and draft.is_multilingual):
+        return "both models must be multilingual"
+    if model.dims.n_text_ctx != draft.dims.n_text_ctx:
+        return "the models have different text contexts"
+    return None
+
+
+def _token_maps(model, draft):
+    """
+    Token id tables between the two vocabularies: (main -> draft, main ids, draft ids)
+
+    Text tokens share their ids; special tokens (languages, tasks, timestamps)
+    are matched by name, since models with more languages shift them.
+    Tokens the draft does not know map to -1.
+    """
+    main_tokenizer = get_tokenizer(True, num_languages=model.num_languages)
+    draft_tokenizer = get_tokenizer(True, num_languages=draft.num_languages)
+    to_draft = torch.full((model.dims.n_vocab,), -1, dtype=torch.long)
+    to_draft[:main_tokenizer.eot] = torch.arange(main_tokenizer.eot)
+    for name, token in main_tokenizer.special_tokens.items():
+        mapped = draft_tokenizer.special_tokens.get(name)
+        if token < model.dims.n_vocab and mapped is not None and mapped < draft.dims.n_vocab:
+            to_draft[token] = mapped
+    main_ids = (to_draft >= 0).nonzero().flatten()
+    return to_draft, main_ids, to_draft[main_ids]
+
+
+def _masked_attention(attn, q: torch.Tensor, k: torch.Tensor, v: torch.Tensor, mask: torch.Tensor) -> torch.Tensor:
+    """Whisper's attention with an explicit mask (its own only handles queries starting at position 0)"""
+    n_batch, n_ctx, n_state = q.shape
+    q = q.view(*q.shape[:2], attn.n_head, -1).permute(0, 2, 1, 3)
+    k = k.view(*k.shape[:2], attn.n_head, -1).permute(0, 2, 1, 3)
+    v = v.view(*v.shape[:2], attn.n_head, -1).permute(0, 2, 1, 3)
+    if SDPA_AVAILABLE and MultiHeadAttention.use_sdpa:
+        out = F.scaled_dot_product_attention(q, k, v, attn_mask=mask.to(q.dtype))
+    else:
+        scale = (n_state // attn.n_head) ** -0.25
+        qk = ((q * scale) @ (k * scale).transpose(-1, -2) + mask).float()
+        out = F.softmax(qk, dim=-1).to(q.dtype) @ v
+    return out.permute(0, 2, 1, 3).flatten(start_dim=2)
+
+
+class DecoderState:
+    """
+    Text decoder of one model with an explicit key/value cache.
+
+    Whisper keeps its cache in forward hooks and can only append to it; here
+    it can be cut back to the tokens that survived verification. Projections
+    are called through `forward`, past any hook, so a draft model can serve
+    another transcription (whose cache hooks sit on the same layers) meanwhile.
+    """
+
+    def __init__(self, model, audio_features: torch.Tensor):
+        decoder = model.decoder
+        self.decoder = decoder
+        self.features = audio_features.to(decoder.token_embedding.weight.dtype)
+        self.length = 0
+        self._keys: List[Optional[torch.Tensor]] = [None] * len(decoder.blocks)
+        self._values: List[Optional[torch.Tensor]] = [None] * len(decoder.blocks)
+        # Cross-attention keys and values depend only on the audio: computed once, as Whisper does
+        self._cross = {}
+        for block in decoder.blocks:
+            self._cross[block.cross_attn.key] = block.cross_attn.key.forward(self.features)
+            self._cross[block.cross_attn.value] = block.cross_attn.value.forward(self.features)
+
+    def __call__(self, tokens: torch.Tensor) -> torch.Tensor:
+        """Logits after each of `tokens`, which continue the cached sequence"""
+        decoder = self.decoder
+        offset = self.length
+        n = tokens.shape[-1]
+        x = decoder.token_embedding(tokens) + decoder.positional_embedding[offset:offset + n]
+        x = x.to(self.features.dtype)
+        for index, block in enumerate(decoder.blocks):
+            x = x + self._self_attention(index, block.attn, block.attn_ln(x), offset)
+            x = x + block.cross_attn(block.cross_attn_ln(x), self.features, kv_cache=self._cross)[0]
+            x = x + block.mlp(block.mlp_ln(x))
+        x = decoder.ln(x)
+        self.length = offset + n
+        return (x @ torch.transpose(decoder.token_embedding.weight.to(x.dtype), 0, 1)).float()
+
+    def _self_attention(self, index: int, attn, x: torch.Tensor, offset: int) -> torch.Tensor:
+        q = attn.query.forward(x)
+        k = attn.key.forward(x)
+        v = attn.value.forward(x)
+        if self._keys[index] is not None:
+            k = torch.cat([self._keys[index], k], dim=1)
+            v = torch.cat([self._values[index], v], dim=1)
+        self._keys[index] = k.detach()
+        self._values[index] = v.detach()
+        n = x.shape[1]
+        if offset == 0 or n == 1:
+            out, _ = attn.qkv_attention(q, k, v, self.decoder.mask)  # exactly Whisper's step
+        else:
+            out = _masked_attention(attn, q, k, v, self.decoder.mask[offset:offset + n, :offset + n])
+        return attn.out(out)
+
+    def truncate(self, length: int):
+        """Forget the cached positions from `length` on"""
+        if length >= self.length:
+            return
+        for index in range(len(self._keys)):
+            if self._keys[index] is not None:
+                self._keys[index] = self._keys[index][:, :length]
+                self._values[index] = self._values[index][:, :length]
+        self.length = length
+
+
+class SpeculativeDecoder:
+    """
+    Greedy decoding of `model` accelerated by a smaller `draft` model.
+
+    The draft proposes a few tokens one by one; the selected model scores all
+    of them in a single decoder pass and keeps them up to the first one it
+    would not have chosen itself, plus its own token at that position. Every
+    kept token is the selected model's greedy choice (same logit filters, same
+    stopping rules), so the transcript is the one plain decoding produces; only
+    the number of passes through the large decoder changes. Floating point can
+    still differ in the last bits between one batched pass and token-by-token
+    passes, which only matters for exact ties.
+
+    Used through `decode`, which replaces `model.decode` during one
+    `model.transcribe` call. Sampling (temperature fallback) and beam search
+    decode normally.
+    """
+
+    def __init__(self, model, draft, audio: np.ndarray, cancel: Optional[threading.Event] = None,
+                 draft_tokens: int = DEFAULT_DRAFT_TOKENS):
+        """
+        Args:
+            model: Selected Whisper model (the one whose output is kept)
+            draft: Smaller Whisper model sharing its text vocabulary (see `incompatibility`)
+            audio: The clip being transcribed (needed when the models use different mel bands)
+            cancel: Event checked before every pass of the selected decoder
+            draft_tokens: Tokens drafted per verification pass
+        """
+        self.model = model
+        self.draft = draft
+        self.audio = audio
+        self.cancel = cancel
+        self.draft_tokens = draft_tokens
+        self.to_draft, self.main_ids, self.draft_ids = _token_maps(model, draft)
+        self.eot = get_tokenizer(True, num_languages=model.num_languages).eot
+        self.stats: Dict[str, int] = {"drafted": 0, "accepted": 0, "passes": 0, "tokens": 0, "windows": 0}
+        self._mels = None
+
+    def decode(self, mel: torch.Tensor, options):
+        """Drop-in for `whisper.decode` bound to `self.model`"""
+        single = mel.ndim == 2
+        batch = mel.unsqueeze(0) if single else mel
+        if batch.shape[0] != 1 or options.temperature > 0 or (options.beam_size or 1) > 1 or options.task == "lang_id":
+            return decode(self.model, mel, options)
+
+        with torch.no_grad():
+            features = self._draft_features(batch[0])
+        result = SpeculativeTask(self.model, options, self, features).run(batch)
+        self.stats["windows"] += 1
+        return result[0] if single else result
+
+    def _draft_features(self, segment: torch.Tensor) -> Optional[torch.Tensor]:
+        """Encode the window for the draft (None if its position in the clip cannot be found)"""
+        if self.draft.dims.n_mels == segment.shape[0]:
+            return self.draft.encoder(segment.unsqueeze(0))
+
+        # Different mel bands (e.g. large-v3/turbo and base): find the window in the
+        # clip, computed as whisper.transcribe does, and take the same frames for the draft
+        if self._mels is None:
+            self._mels = (log_mel_spectrogram(self.audio, self.model.dims.n_mels, padding=N_SAMPLES),
+                          log_mel_spectrogram(self.audio, self.draft.dims.n_mels, padding=N_SAMPLES))
+        full, draft_full = self._mels
+        segment = segment.to(full.dtype).cpu()
+        starts = (full == segment[:, :1]).all(dim=0).nonzero().flatten().tolist()
+        for start in starts:
+            width = min(N_FRAMES, full.shape[1] - start)
+            equal = (segment[:, :width] == full[:, start:start + width]).all(dim=0)
+            frames = width if bool(equal.all()) else int((~equal).nonzero()[0])
+            # The rest of the window is Whisper's zero padding
+            if frames > 0 and not segment[:, frames:].any():
+                window = pad_or_trim(draft_full[:, start:start + frames], N_FRAMES)
+                return self.draft.encoder(window.unsqueeze(0).to(segment.device))
+        return None
+
+    def propose(self, state: DecoderState, tokens: torch.Tensor, count: int, logit_filters) -> List[int]:
+        """
+        Let the draft continue `tokens` by up to `count` tokens (main vocabulary ids)
+
+        The draft's logits are mapped into the main vocabulary and go through the
+        same logit filters, so it never proposes what the selected model may not emit.
+        """
+        pending = self.to_draft[tokens[0, state.length:]]
+        if (pending < 0).any():
+            return []
+        proposals = []
+        prefix = tokens
+        for _ in range(count):
+            draft_logits = state(pending.unsqueeze(0))[:, -1]
+            logits = torch.full((1, self.model.dims.n_vocab), -np.inf, device=draft_logits.device)
+            logits[:, self.main_ids] = draft_logits[:, self.draft_ids]
+            for logit_filter in logit_filters:
+                logit_filter.apply(logits, prefix)
+            token = int(logits.argmax(dim=-1))
+            proposals.append(token)
+            if token == self.eot:
+                break
+            prefix = torch.cat([prefix, torch.tensor([[token]], device=prefix.device)], dim=-1)
+            pending = self.to_draft[token:token + 1]
+        return proposals
+
+    def summary(self) -> Dict[str, float]:
+        """Acceptance rate of drafted tokens and tokens produced per pass of the selected decoder"""
+        stats = dict(self.stats)
+        stats["acceptance"] = stats["accepted"] / stats["drafted"] if stats["drafted"] else 0.0
+        stats["tokens_per_pass"] = stats["tokens"] / stats["passes"] if stats["passes"] else 0.0
+        return stats
+
+
+class SpeculativeTask(DecodingTask):
+    """Whisper's decoding task with the token loop replaced by draft-and-verify"""
+
+    def __init__(self, model, options, speculator: SpeculativeDecoder, draft_features: Optional[torch.Tensor]):
+        super().__init__(model, options)
+        self.speculator = speculator
+        self.draft_features = draft_features
+
+    def _main_loop(self, audio_features: torch.Tensor, tokens: torch.Tensor):
+        speculator = self.speculator
+        if tokens.shape[0] != 1 or self.draft_features is None or (speculator.to_draft[tokens[0]] < 0).any():
+            return super()._main_loop(audio_features, tokens)
+
+        sum_logprobs = torch.zeros(1, device=audio_features.device)
+        no_speech_probs = [np.nan]
+        main = DecoderState(self.model, audio_features)
+        draft = DecoderState(speculator.draft, self.draft_features)
+        stats = speculator.stats
+
+        # First pass over the prompt, as in Whisper's loop
+        check_cancelled(speculator.cancel)
+        logits = main(tokens)
+        stats["passes"] += 1
+        if self.tokenizer.no_speech is not None:
+            probs_at_sot = logits[:, self.sot_index].float().softmax(dim=-1)
+            no_speech_probs = probs_at_sot[:, self.tokenizer.no_speech].tolist()
+        candidates = [logits[:, -1]]
+        proposals: List[int] = []
+        steps = 0
+
+        while True:
+            # Keep the selected model's choices while they match the draft
+            done = False
+            for position, next_logits in enumerate(candidates):
+                for logit_filter in self.logit_filters:
+                    logit_filter.apply(next_logits, tokens)
+                tokens, completed = self.decoder.update(tokens, next_logits, sum_logprobs)
+                steps += 1
+                stats["tokens"] += 1
+                matched = position < len(proposals) and int(tokens[0, -1]) == proposals[position]
+                stats["accepted"] += matched
+                if completed or tokens.shape[-1] > self.n_ctx or steps >= self.sample_len:
+                    done = True
+                    break
+                if not matched:
+                    break
+            if done:
+                break
+
+            # Both caches end before the last token, which has not been fed yet
+            main.truncate(tokens.shape[-1] - 1)
+            draft.truncate(tokens.shape[-1] - 1)
+            room = min(speculator.draft_tokens, self.sample_len - steps - 1, self.n_ctx - tokens.shape[-1])
+            proposals = speculator.propose(draft, tokens, room, self.logit_filters) if room > 0 else []
+            stats["drafted"] += len(proposals)
+
+            check_cancelled(speculator.cancel)
+            fed = torch.cat([tokens[:, main.length:], torch.tensor([proposals], dtype=tokens.dtype,
+                                                                   device=tokens.device)], dim=-1)
+            logits = main(fed)
+            stats["passes"] += 1
+            candidates = [logits[:, index] for index in range(logits.shape[1])]
+
+        return tokens, sum_logprobs, no_speech_probs
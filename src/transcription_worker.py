@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Transcription Worker Module
+Long-lived process that holds the model; audio is passed through shared memory
+"""
+
+import os
+import sys
+import time
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from engines import TranscriptionCancelled, TranscriptionEngine, check_cancelled
+
+# Seconds of audio the shared buffer holds before it has to grow
+INITIAL_BUFFER_SECONDS = 60
+SAMPLE_RATE = 16000
+
+# How often a waiting transcription checks its cancel event
+CANCEL_POLL_SECONDS = 0.02
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open a block created by the GUI process without taking ownership of it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions register the block again, but spawned children share the
+    # owner's resource tracker, so the owner's unlink still settles it
+    return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(spec: str, fast_load: bool, conn, cancel):
+    """
+    Worker loop: load the engine once, then transcribe every request
+
+    Requests are (job_id, block name, sample count, options); None stops the
+    worker. Replies are ("ready", info), ("result", job_id, result),
+    ("cancelled", job_id, "") and ("error", job_id, message). `cancel` is an
+    event shared with the GUI process.
+    """
+    import warnings
+    warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    from engines import create_engine
+    from model_registry import get_registry
+
+    try:
+        get_registry().fast_load = fast_load
+        started = time.time()
+        engine = create_engine(spec)
+        conn.send(("ready", {"pid": os.getpid(), "engine": engine.name, "load_s": time.time() - started,
+                             "memory_bytes": engine.memory_bytes()}))
+    except Exception as e:
+        conn.send(("error", None, f"{type(e).__name__}: {e}"))
+        return
+
+    blocks: Dict[str, shared_memory.SharedMemory] = {}
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        job_id, name, count, options = request
+        try:
+            if name not in blocks:
+                for block in blocks.values():
+                    block.close()  # the GUI process replaced its buffer
+                blocks = {name: _attach(name)}
+            audio = np.ndarray((count,), dtype=np.float32, buffer=blocks[name].buf)
+            result = engine.transcribe(audio, cancel=cancel, **options)
+            del audio
+            conn.send(("result", job_id, result))
+        except TranscriptionCancelled:
+            conn.send(("cancelled", job_id, ""))
+        except Exception as e:
+            conn.send(("error", job_id, f"{type(e).__name__}: {e}"))
+
+    for block in blocks.values():
+        block.close()
+
+
+class WorkerCrashed(RuntimeError):
+    """The worker process died while loading or transcribing"""
+
+
+class RemoteEngine(TranscriptionEngine):
+    """
+    Engine that runs another engine in a separate process.
+
+    The GUI process only copies the samples into a shared memory block (they
+    are never pickled) and waits for the result, so inference does not compete
+    with Tk for the GIL and a crash in the model does not take the app down.
+    A dead worker is started again on the next transcription.
+    """
+
+    name = "worker"
+
+    def __init__(self, model_name: str, fast_load: Optional[bool] = None,
+                 log_callback=None, startup_timeout: Optional[float] = None):
+        """
+        Start the worker and wait until its model is loaded
+
+        Args:
+            model_name: Model (with optional engine prefix) the worker loads, e.g. "turbo", "faster-whisper:turbo"
+            fast_load: Memory-mapped checkpoint loading in the worker (default: same as this process)
+            log_callback: Function used to report worker starts and crashes
+            startup_timeout: Seconds to wait for the model to load (None waits as long as needed)
+        """
+        super().__init__(model_name)
+        if fast_load is None:
+            from model_registry import get_registry
+            fast_load = get_registry().fast_load
+        self.spec = model_name
+        self.fast_load = fast_load
+        self.log_callback = log_callback
+        self.startup_timeout = startup_timeout
+        self.info: Dict[str, Any] = {}
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._job_id = 0
+        self._process = None
+        self._conn = None
+        self._cancel = None
+        self._block: Optional[shared_memory.SharedMemory] = None
+        self._start()
+
+    def log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def _start(self):
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self._cancel = context.Event()
+        self._process = context.Process(target=_worker_main,
+                                        args=(self.spec, self.fast_load, child_conn, self._cancel),
+                                        name=f"simplevoice-worker-{self.spec}", daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+        reply = self._receive(self.startup_timeout)
+        if reply[0] != "ready":
+            self._stop()
+            raise WorkerCrashed(f"Worker could not load '{self.spec}': {reply[2]}")
+        self.info = reply[1]
+        self.log(f"🧩 Worker process {self.info['pid']} ready with '{self.spec}' "
+                 f"({self.info['engine']}, {self.info['load_s']:.1f}s)")
+
+    def _receive(self, timeout: Optional[float] = None, cancel: Optional[threading.Event] = None):
+        """
+        Wait for a reply; a dead worker wakes us up through its sentinel
+
+        Without a cancel event nothing is polled. With one, it is checked every
+        CANCEL_POLL_SECONDS and forwarded to the worker, which answers "cancelled".
+        """
+        if cancel is None:
+            ready = wait([self._conn, self._process.sentinel], timeout)
+        else:
+            while True:
+                ready = wait([self._conn, self._process.sentinel], CANCEL_POLL_SECONDS)
+                if ready:
+                    break
+                if cancel.is_set():
+                    self._cancel.set()
+        if self._conn in ready:
+            try:
+                return self._conn.recv()
+            except EOFError:
+                pass
+        if not ready:
+            self._stop()
+            raise WorkerCrashed(f"Worker for '{self.spec}' did not answer in {timeout:.0f}s")
+        self._process.join(timeout=1)  # the pipe can close just before the process is reaped
+        code = self._process.exitcode
+        self._stop()
+        raise WorkerCrashed(f"Worker for '{self.spec}' exited (code {code})")
+
+    def _buffer(self, count: int) -> shared_memory.SharedMemory:
+        """Shared block with room for `count` float32 samples (reused between jobs, grown by doubling)"""
+        needed = count * 4
+        if self._block is None or self._block.size < needed:
+            size = max(needed, INITIAL_BUFFER_SECONDS * SAMPLE_RATE * 4,
+                       2 * self._block.size if self._block is not None else 0)
+            self._release_buffer()
+            self._block = shared_memory.SharedMemory(create=True, size=size)
+        return self._block
+
+    def _release_buffer(self):
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def transcribe(self, audio: np.ndarray, cancel: Optional[threading.Event] = None, **options) -> Dict[str, Any]:
+        check_cancelled(cancel)
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self.restarts += 1
+                self.log(f"🔁 Restarting transcription worker for '{self.spec}'")
+                self._start()
+
+            count = len(audio)
+            block = self._buffer(count)
+            np.ndarray((count,), dtype=np.float32, buffer=block.buf)[:] = audio
+            self._job_id += 1
+            self._cancel.clear()
+            self._conn.send((self._job_id, block.name, count, options))
+
+            try:
+                reply = self._receive(cancel=cancel)
+            except WorkerCrashed as e:
+                self.log(f"💥 {e}")
+                raise
+            if reply[0] == "cancelled":
+                raise TranscriptionCancelled()
+            if reply[0] == "error":
+                raise RuntimeError(reply[2])
+            return reply[2]
+
+    def restart(self):
+        """Replace the worker process (e.g. after changing its settings)"""
+        with self._lock:
+            self._stop()
+            self.restarts += 1
+            self._start()
+
+    def memory_bytes(self) -> int:
+        """Memory held by the model in the worker process"""
+        return int(self.info.get("memory_bytes", 0))
+
+    def _stop(self):
+        if self._process is not None:
+            try:
+                if self._process.is_alive():
+                    self._conn.send(None)
+                    self._process.join(timeout=2)
+                if self._process.is_alive():
+                    self._process.terminate()
+                    self._process.join(timeout=1)
+            except (OSError, ValueError):
+                pass
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def close(self):
+        """Stop the worker and free the shared buffer"""
+        with self._lock:
+            self._stop()
+            self._release_buffer()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - System Tray
+Proceso del icono de la barra de menú. Este módulo solo importa la biblioteca
+estándar (pystray y PIL se importan dentro del proceso): con el arranque 'spawn'
+el hijo importa este módulo y nada de gui.py, recorder.py, whisper ni torch.
+"""
+
+import sys
+import queue
+
+# Módulos que nunca deberían cargarse en el proceso del tray
+HEAVY_MODULES = ("torch", "whisper", "numpy", "customtkinter", "recorder", "gui")
+
+TRAY_STATES = ('idle', 'recording', 'processing')
+
+
+def rss_mb():
+    """Memoria residente máxima del proceso en MB (None si no se puede medir)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB, macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def footprint():
+    """Módulos cargados y memoria del proceso actual"""
+    return {
+        "module_count": len(sys.modules),
+        "heavy_modules": [name for name in HEAVY_MODULES if name in sys.modules],
+        "rss_mb": rss_mb(),
+    }
+
+
+def run_tray_process(event_queue, status_queue):
+    """Ejecutar system tray en proceso separado"""
+    import threading
+    try:
+        import pystray
+        from PIL import Image, ImageDraw
+
+        # Informar al proceso principal de lo que cargó este proceso
+        event_queue.put(('footprint', footprint()))
+
+        # Crear icono para el tray
+        def create_tray_icon_static(state='idle'):
+            size = 64
+            image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+
+            if state == 'recording':
+                color = (220, 50, 50, 255)  # Rojo
+            elif state == 'processing':
+                color = (138, 43, 226, 255) # Morado
+            else:  # 'idle'
+                color = (50, 150, 220, 255)  # Azul
+
+            margin = 8
+            draw.ellipse([margin, margin, size-margin, size-margin], fill=color)
+
+            inner_margin = 16
+            inner_color = tuple(min(255, c + 40) for c in color[:3]) + (255,)
+            draw.ellipse([inner_margin, inner_margin, size-inner_margin, size-inner_margin], fill=inner_color)
+
+            center_margin = 24
+            center_color = (255, 255, 255, 255)
+            draw.ellipse([center_margin, center_margin, size-center_margin, size-center_margin], fill=center_color)
+
+            return image
+
+        # Estado del tray
+        current_state = 'idle'
+        queued = 0  # Transcripciones pendientes en el proceso principal
+        icon = None
+
+        def on_record_click(icon_obj, item):
+            event_queue.put(('toggle_recording',))
+
+        def on_cancel_click(icon_obj, item):
+            event_queue.put(('cancel_transcription',))
+
+        def on_options_click(icon_obj, item):
+            event_queue.put(('show_window',))
+
+        def on_quit_click(icon_obj, item):
+            event_queue.put(('quit',))
+            icon_obj.stop()
+
+        def create_menu():
+            is_recording = current_state == 'recording'
+            is_processing = current_state == 'processing'
+
+            if is_recording:
+                record_text = "⏹️ Stop Recording"
+            elif is_processing:
+                # Se puede grabar mientras se transcribe lo anterior
+                record_text = f"🎙️ Start Recording ({queued} transcribing)"
+            else:
+                record_text = "🎙️ Start Recording"
+
+            return pystray.Menu(
+                pystray.MenuItem(record_text, on_record_click),
+                pystray.MenuItem("✖️ Cancel Transcription", on_cancel_click, enabled=queued > 0 or is_processing),
+                pystray.MenuItem("⚙️ Options", on_options_click),
+                pystray.Menu.SEPARATOR,
+                pystray.MenuItem("❌ Quit", on_quit_click)
+            )
+
+        def apply_status(messages):
+            """Aplicar solo el último estado de un lote de mensajes (los intermedios ya no importan)"""
+            nonlocal current_state, queued
+            states = [message[1] for message in messages if message[0] == 'state']
+            depths = [message[1] for message in messages if message[0] == 'queue']
+            changed = False
+            if states and states[-1] != current_state:
+                current_state = states[-1]
+                # Iconos ya dibujados: cambiar de estado no vuelve a pintar nada
+                icon.icon = icons[current_state]
+                changed = True
+            if depths and depths[-1] != queued:
+                queued = depths[-1]
+                icon.title = f"SimpleVoice - {queued} transcription(s) queued" if queued else "SimpleVoice - Voice Transcriptor"
+                changed = True
+            if changed:
+                icon.menu = create_menu()
+
+        def listen_status():
+            """Esperar bloqueado los mensajes del proceso principal (sin sondeo ni timers)"""
+            while True:
+                try:
+                    messages = [status_queue.get()]
+                    while True:
+                        messages.append(status_queue.get_nowait())
+                except queue.Empty:
+                    pass
+                except (EOFError, OSError, ValueError):
+                    break
+
+                if any(message[0] == 'stop' for message in messages):
+                    icon.stop()
+                    break
+                try:
+                    apply_status(messages)
+                except Exception as e:
+                    print(f"⚠️ Error actualizando tray: {e}")
+
+        # Dibujar una vez el icono de cada estado
+        icons = {state: create_tray_icon_static(state) for state in TRAY_STATES}
+
+        # Crear y ejecutar icono
+        icon = pystray.Icon(
+            "SimpleVoice",
+            icons['idle'],
+            "SimpleVoice - Voice Transcriptor",
+            create_menu()
+        )
+
+        threading.Thread(target=listen_status, name="tray-status", daemon=True).start()
+
+        icon.run()
+
+    except Exception as e:
+        print(f"⚠️ Error en proceso tray: {e}")
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+SimpleVoice - Voice Activity Detection Module
+Energy-based, NumPy-vectorized speech detection used to skip silence before inference
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Frames quieter than this (dBFS) are never considered speech
+ABSOLUTE_FLOOR_DB = -50.0
+# Speech must rise at least this much above the clip's noise floor
+NOISE_MARGIN_DB = 12.0
+# Cap for the adaptive threshold, so clips with almost no pauses are not trimmed into speech
+THRESHOLD_CEILING_DB = -35.0
+
+
+def frame_energies(audio: np.ndarray, sample_rate: int = 16000, frame_ms: int = 30) -> np.ndarray:
+    """
+    RMS level of consecutive frames in dBFS
+
+    Args:
+        audio: Float32 mono samples in [-1, 1]
+        sample_rate: Sample rate of the audio
+        frame_ms: Frame length in milliseconds
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32)
+
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20.0 * np.log10(rms + 1e-10)
+
+
+def speech_threshold(energies: np.ndarray) -> float:
+    """Adaptive threshold: noise floor (10th percentile) plus a margin, clamped to [floor, ceiling]"""
+    if len(energies) == 0:
+        return ABSOLUTE_FLOOR_DB
+    noise_floor = float(np.percentile(energies, 10))
+    return min(max(noise_floor + NOISE_MARGIN_DB, ABSOLUTE_FLOOR_DB), THRESHOLD_CEILING_DB)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end indices (end exclusive) of the True runs in a boolean array"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_speech(audio: np.ndarray, sample_rate: int = 16000, frame_ms: int = 30,
+                  min_speech_ms: int = 150, padding_ms: int = 300) -> List[Tuple[int, int]]:
+    """
+    Find the speech regions of a clip
+
+    Args:
+        audio: Float32 mono samples in [-1, 1]
+        sample_rate: Sample rate of the audio
+        frame_ms: Analysis frame length in milliseconds
+        min_speech_ms: Louder bursts shorter than this (clicks, key presses) are ignored
+        padding_ms: Context kept around each region so word edges are not clipped
+
+    Returns:
+        List of (start, end) sample indices, end exclusive, in chronological order
+    """
+    energies = frame_energies(audio, sample_rate, frame_ms)
+    if len(energies) == 0:
+        return []
+
+    voiced = energies > speech_threshold(energies)
+
+    # Drop bursts that are too short to be speech
+    min_frames = max(1, int(np.ceil(min_speech_ms / frame_ms)))
+    starts, ends = _runs(voiced)
+    for start, end in zip(starts, ends):
+        if end - start < min_frames:
+            voiced[start:end] = False
+    if not voiced.any():
+        return []
+
+    # Pad every region with some context (dilation of the voiced mask)
+    pad = int(np.ceil(padding_ms / frame_ms))
+    if pad > 0:
+        voiced = np.convolve(voiced, np.ones(2 * pad + 1, dtype=np.int8), mode="same") > 0
+
+    frame_len = int(sample_rate * frame_ms / 1000)
+    starts, ends = _runs(voiced)
+    # A region that reaches the last frame also keeps the trailing partial frame
+    return [(int(s) * frame_len, len(audio) if e == len(voiced) else int(e) * frame_len)
+            for s, e in zip(starts, ends)]
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int = 16000, **kwargs) -> Tuple[np.ndarray, float]:
+    """
+    Keep only the speech regions of a clip (leading, trailing and long inner pauses are removed)
+
+    Args:
+        audio: Float32 mono samples in [-1, 1]
+        sample_rate: Sample rate of the audio
+        **kwargs: Extra arguments for `detect_speech`
+
+    Returns:
+        (speech audio, seconds removed). The audio is empty when no speech was found.
+    """
+    regions = detect_speech(audio, sample_rate, **kwargs)
+    if not regions:
+        return audio[:0], len(audio) / float(sample_rate)
+
+    if len(regions) == 1:
+        start, end = regions[0]
+        speech = audio[start:end]  # a view, no copy needed
+    else:
+        speech = np.concatenate([audio[start:end] for start, end in regions])
+
+    return speech, (len(audio) - len(speech)) / float(sample_rate)
+
+
+class SpeechSegmenter:
+    """
+    Incremental VAD that splits a live stream into utterances at pauses.
+
+    Audio is fed as it is captured; `feed` returns the (start, end) sample
+    indices (absolute, since the first sample fed) of every utterance that was
+    closed by a pause long enough, or by reaching the maximum segment length.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30, pause_ms: int = 700,
+                 min_speech_ms: int = 250, padding_ms: int = 300, max_segment_s: float = 25.0):
+        """
+        Initialize the segmenter
+
+        Args:
+            sample_rate: Sample rate of the audio
+            frame_ms: Analysis frame length in milliseconds
+            pause_ms: Silence that closes an utterance
+            min_speech_ms: Utterances with less voiced audio than this are discarded
+            padding_ms: Context kept before and after each utterance
+            max_segment_s: Utterances are cut at this length even without a pause
+        """
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, int(sample_rate * frame_ms / 1000))
+        self.pause_frames = max(1, int(np.ceil(pause_ms / frame_ms)))
+        self.min_speech_frames = max(1, int(np.ceil(min_speech_ms / frame_ms)))
+        self.padding = int(sample_rate * padding_ms / 1000)
+        self.max_segment = int(sample_rate * max_segment_s)
+        self.frame_ms = frame_ms
+
+        self._pending = np.empty(0, dtype=np.float32)
+        self._position = 0  # Absolute index of the first sample in `_pending`
+        self._noise_floor = None
+        self._speech_start = None
+        self._voiced_frames = 0
+        self._silent_frames = 0
+
+    @property
+    def keep_from(self) -> int:
+        """Absolute index before which no future utterance can start (older audio may be discarded)"""
+        if self._speech_start is not None:
+            return max(0, self._speech_start - self.padding)
+        return max(0, self._position - self.padding)
+
+    def _threshold(self) -> float:
+        return min(max(self._noise_floor + NOISE_MARGIN_DB, ABSOLUTE_FLOOR_DB), THRESHOLD_CEILING_DB)
+
+    def feed(self, audio: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Process newly captured audio
+
+        Args:
+            audio: Float32 mono samples in [-1, 1]
+
+        Returns:
+            Utterances closed by this chunk, as absolute (start, end) sample indices
+        """
+        if len(self._pending):
+            audio = np.concatenate((self._pending, audio))
+        n_frames = len(audio) // self.frame_len
+        energies = frame_energies(audio[:n_frames * self.frame_len], self.sample_rate, self.frame_ms)
+        self._pending = audio[n_frames * self.frame_len:].copy()
+
+        segments = []
+        for energy in energies:
+            frame_start = self._position
+            self._position += self.frame_len
+
+            # Track the noise floor: follow drops immediately, rise slowly (0.1 dB per frame)
+            if self._noise_floor is None or energy < self._noise_floor:
+                self._noise_floor = float(energy)
+            else:
+                self._noise_floor += 0.1
+
+            if energy > self._threshold():
+                if self._speech_start is None:
+                    self._speech_start = frame_start
+                    self._voiced_frames = 0
+                self._voiced_frames += 1
+                self._silent_frames = 0
+            elif self._speech_start is not None:
+                self._silent_frames += 1
+
+            if self._speech_start is None:
+                continue
+
+            if self._silent_frames >= self.pause_frames:
+                segment = self._close(self._position - self._silent_frames * self.frame_len)
+                if segment:
+                    segments.append(segment)
+            elif self._position - self._speech_start >= self.max_segment:
+                segment = self._close(self._position, pad_end=False)
+                if segment:
+                    segments.append(segment)
+
+        return segments
+
+    def _close(self, speech_end: int, pad_end: bool = True) -> Optional[Tuple[int, int]]:
+        """Finish the current utterance; returns None if it was too short to be speech"""
+        start = max(0, self._speech_start - self.padding)
+        end = min(self._position, speech_end + self.padding) if pad_end else speech_end
+        long_enough = self._voiced_frames >= self.min_speech_frames
+        self._speech_start = None
+        self._voiced_frames = 0
+        self._silent_frames = 0
+        return (start, end) if long_enough else None
+
+    def flush(self) -> Optional[Tuple[int, int]]:
+        """Close the utterance in progress (e.g. when capture stops)"""
+        if self._speech_start is None:
+            return None
+        self._position += len(self._pending)
+        self._pending = np.empty(0, dtype=np.float32)
+        return self._close(self._position - self._silent_frames * self.frame_len)
+
+
+def split_at_silence(audio: np.ndarray, sample_rate: int = 16000, max_segment_s: float = 30.0,
+                     min_segment_s: float = 10.0, frame_ms: int = 30) -> List[Tuple[int, int]]:
+    """
+    Split a long clip into contiguous pieces, cutting in the quietest pauses
+
+    Args:
+        audio: Float32 mono samples in [-1, 1]
+        sample_rate: Sample rate of the audio
+        max_segment_s: No piece is longer than this
+        min_segment_s: Cuts are searched between this length and `max_segment_s`
+        frame_ms: Analysis frame length in milliseconds
+
+    Returns:
+        List of (start, end) sample indices covering the whole clip
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    max_len = int(max_segment_s * sample_rate)
+    if len(audio) <= max_len:
+        return [(0, len(audio))]
+
+    energies = frame_energies(audio, sample_rate, frame_ms)
+    quiet = energies <= speech_threshold(energies)
+
+    # Score each frame by the length of the pause it belongs to: cut in the middle of long pauses
+    pause_length = np.zeros(len(energies), dtype=np.int32)
+    starts, ends = _runs(quiet)
+    for start, end in zip(starts, ends):
+        pause_length[(start + end) // 2] = end - start
+
+    min_frames = int(min_segment_s * sample_rate) // frame_len
+    max_frames = max_len // frame_len
+    segments = []
+    start_frame = 0
+    total_frames = len(energies)
+    while (total_frames - start_frame) * frame_len > max_len:
+        window = pause_length[start_frame + min_frames:start_frame + max_frames]
+        if window.any():
+            cut = start_frame + min_frames + int(np.argmax(window))
+        else:
+            cut = start_frame + max_frames  # No pause at all: hard cut
+        segments.append((start_frame * frame_len, cut * frame_len))
+        start_frame = cut
+
+    segments.append((start_frame * frame_len, len(audio)))
+    return segments
@@ -0,0 +1,88 @@
+"""
+The tray runs in its own spawned process and must stay light: importing the
+ML stack (or the GUI modules that pull it in) there would cost hundreds of MB.
+"""
+
+import os
+import sys
+import types
+import threading
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+# Modules the tray process must never load (the first ones weigh hundreds of MB)
+FORBIDDEN_MODULES = ("torch", "whisper", "numpy", "customtkinter", "recorder", "gui",
+                     "engines", "model_manager", "transcription_worker")
+
+# Peak RSS allowed to the tray child; a bare interpreter uses ~10-20 MB, torch alone > 150 MB
+RSS_LIMIT_MB = 60
+
+
+def _install_stubs(event_queue):
+    """Replace pystray and PIL (GUI libraries, not needed to check what the tray imports)"""
+    stopped = threading.Event()
+
+    class Icon:
+        def __init__(self, name, icon, title, menu):
+            self.icon, self.title, self.menu = icon, title, menu
+
+        def run(self):
+            # Reached only when the tray finished setting up: report what it loaded
+            event_queue.put(("modules", sorted(sys.modules)))
+            stopped.wait(30)
+
+        def stop(self):
+            stopped.set()
+
+    class Menu:
+        SEPARATOR = object()
+
+        def __init__(self, *items):
+            self.items = items
+
+    pystray = types.ModuleType("pystray")
+    pystray.Icon = Icon
+    pystray.Menu = Menu
+    pystray.MenuItem = lambda text, action, enabled=True: (text, action, enabled)
+
+    image = types.ModuleType("PIL.Image")
+    image.new = lambda mode, size, color: types.SimpleNamespace(mode=mode, size=size)
+    image_draw = types.ModuleType("PIL.ImageDraw")
+    image_draw.Draw = lambda image: types.SimpleNamespace(ellipse=lambda box, fill: None)
+    pil = types.ModuleType("PIL")
+    pil.Image = image
+    pil.ImageDraw = image_draw
+    sys.modules.update({"pystray": pystray, "PIL": pil, "PIL.Image": image, "PIL.ImageDraw": image_draw})
+
+
+def _run_stubbed_tray(event_queue, status_queue):
+    """Child process: the real tray loop with stubbed GUI libraries"""
+    _install_stubs(event_queue)
+    import tray
+    tray.run_tray_process(event_queue, status_queue)
+
+
+def test_tray_process_never_loads_heavy_modules():
+    context = multiprocessing.get_context("spawn")  # the same start method as the app
+    event_queue = context.Queue()
+    status_queue = context.Queue()
+    process = context.Process(target=_run_stubbed_tray, args=(event_queue, status_queue), daemon=True)
+    process.start()
+    try:
+        events = dict(event_queue.get(timeout=60) for _ in range(2))
+    finally:
+        status_queue.put(("stop",))
+        process.join(timeout=10)
+        if process.is_alive():
+            process.terminate()
+
+    assert process.exitcode == 0
+
+    loaded = [name for name in events["modules"] if name.split(".")[0] in FORBIDDEN_MODULES]
+    assert loaded == []
+
+    footprint = events["footprint"]
+    assert footprint["heavy_modules"] == []
+    if footprint["rss_mb"] is not None:  # not measurable on Windows
+        assert footprint["rss_mb"] < RSS_LIMIT_MB